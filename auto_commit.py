@@ -2,20 +2,50 @@
 """
 Auto-Commit System - Backs up brain changes hourly
 Integrates with memory operations to track and commit changes
+
+Change detection is delegated to `git status`. On git >= 2.36, enable
+`core.fsmonitor` and `core.untrackedCache` in the brain repo (done by
+setup_auto_backup.sh) so that check only touches changed paths.
 """
 
 import subprocess
 import json
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-import hashlib
+
+try:
+    from obsidian_deep_sync import deep_sync_everything
+    _HAS_OBSIDIAN = True
+except ImportError:
+    _HAS_OBSIDIAN = False
+
+# Brain repo to back up; override with the BRAIN_DIR environment variable
+BRAIN_DIR = Path(os.environ.get("BRAIN_DIR", Path.home() / "brain-poc"))
+
+# File types that trigger a commit in `watch` mode, and files that never do
+WATCH_PATTERNS = ["*.py", "*.sh", "*.md", "*.json"]
+WATCH_IGNORE = [".auto_commit_state.json", "active_goals.json", "wins_log.json"]
+WATCH_SETTLE = 30  # seconds to let a burst of edits finish before committing
+
+
+def _sync_to_obsidian():
+    """Deep sync the brain to Obsidian, reporting instead of raising"""
+    try:
+        deep_sync_everything()
+        print("✅ Synced to Obsidian")
+    except Exception as e:
+        print(f"⚠️ Obsidian sync failed: {e}")
 
 class AutoCommit:
-    def __init__(self):
-        self.brain_dir = Path("/Users/tarive/brain-poc")
+    def __init__(self, brain_dir: Path = BRAIN_DIR):
+        self.brain_dir = Path(brain_dir)
         self.state_file = self.brain_dir / ".auto_commit_state.json"
         self.commit_interval = 3600  # 1 hour in seconds
+        self._status_cache = None  # (monotonic time, raw git status output)
+        self.change_check_ttl = 60  # seconds should_commit() trusts that output
         
         # Load or initialize state
         self.state = self._load_state()
@@ -24,69 +54,75 @@ class AutoCommit:
         """Load auto-commit state"""
         if self.state_file.exists():
             with open(self.state_file) as f:
-                return json.load(f)
+                state = json.load(f)
+            # Older state files stored last_commit as an ISO string
+            if isinstance(state.get("last_commit"), str):
+                state["last_commit"] = int(
+                    datetime.fromisoformat(state["last_commit"]).timestamp()
+                )
+            return state
         return {
             "last_commit": None,
-            "last_hash": None,
             "commits_today": 0,
             "total_commits": 0
         }
     
     def _save_state(self):
         """Save auto-commit state"""
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
-    
-    def _get_repo_hash(self) -> str:
-        """Get hash of current repo state"""
-        # Get list of tracked files and their modification times
-        tracked_files = []
-        for pattern in ["*.py", "*.sh", "*.md", "*.json"]:
-            for file in self.brain_dir.glob(pattern):
-                if file.name not in ['.auto_commit_state.json', 'active_goals.json', 'wins_log.json']:
-                    stat = file.stat()
-                    tracked_files.append(f"{file.name}:{stat.st_mtime}")
-        
-        # Create hash of current state
-        content = "|".join(sorted(tracked_files))
-        return hashlib.md5(content.encode()).hexdigest()
-    
-    def should_commit(self) -> bool:
-        """Check if we should auto-commit"""
+        self._status_cache = None
+        # Write a sibling temp file and rename it over the old state so a
+        # crash mid-write can never leave a truncated state file behind
+        tmp_file = self.state_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, separators=(",", ":"))
+        os.replace(tmp_file, self.state_file)
+    
+    def should_commit(self, force: bool = False) -> bool:
+        """Check if we should auto-commit (always True when forced)"""
+        if force:
+            return True
+        
         # Check if enough time has passed
         if self.state["last_commit"]:
-            last_commit = datetime.fromisoformat(self.state["last_commit"])
-            time_since = datetime.now() - last_commit
-            
-            if time_since.total_seconds() < self.commit_interval:
+            if time.time() - self.state["last_commit"] < self.commit_interval:
                 return False
         
-        # Check if there are changes
-        current_hash = self._get_repo_hash()
-        if current_hash == self.state.get("last_hash"):
-            return False  # No changes
+        # Ask git for changes instead of re-stat'ing the tree ourselves
+        return bool(self._git_status_porcelain(self.change_check_ttl))
+    
+    def _git_status_porcelain(self, max_age: float = 1.0) -> bytes:
+        """Raw `git status --porcelain -z` output, reused for max_age seconds.
+        
+        -z terminates every entry with NUL (exactly one per file with
+        --no-renames), so callers can count or split without decoding.
+        """
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < max_age:
+            return self._status_cache[1]
         
-        return True
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "--no-renames"],
+            capture_output=True,
+            cwd=self.brain_dir
+        )
+        self._status_cache = (now, result.stdout)
+        return result.stdout
     
-    def auto_commit(self, message: str = None) -> bool:
-        """Perform auto-commit if needed"""
-        if not self.should_commit():
+    def auto_commit(self, message: str = None, force: bool = False) -> bool:
+        """Perform auto-commit if needed, or unconditionally when forced"""
+        if not self.should_commit(force):
             return False
         
         try:
-            # Check for changes
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True,
-                text=True,
-                cwd=self.brain_dir
+            # should_commit() already ran git status and found changes.
+            # `commit -a` picks up tracked edits; new files still need add.
+            # A forced commit skipped git status, so always stage then.
+            has_untracked = force or any(
+                entry.startswith(b"??")
+                for entry in self._git_status_porcelain(self.change_check_ttl).split(b"\0")
             )
-            
-            if not result.stdout.strip():
-                return False  # No changes to commit
-            
-            # Stage all changes
-            subprocess.run(["git", "add", "-A"], cwd=self.brain_dir)
+            if has_untracked:
+                subprocess.run(["git", "add", "-A"], cwd=self.brain_dir)
             
             # Generate commit message
             if not message:
@@ -95,41 +131,35 @@ class AutoCommit:
             
             # Commit
             commit_result = subprocess.run(
-                ["git", "commit", "-m", message],
+                ["git", "commit", "-a", "-m", message, "--quiet"],
                 capture_output=True,
-                text=True,
                 cwd=self.brain_dir
             )
             
             if commit_result.returncode == 0:
                 # Update state
-                self.state["last_commit"] = datetime.now().isoformat()
-                self.state["last_hash"] = self._get_repo_hash()
+                self.state["last_commit"] = int(time.time())
                 self.state["commits_today"] += 1
                 self.state["total_commits"] += 1
                 self._save_state()
                 
-                # Push to remote
-                push_result = subprocess.run(
-                    ["git", "push"],
-                    capture_output=True,
-                    text=True,
-                    cwd=self.brain_dir
-                )
-                
-                # DEEP SYNC TO OBSIDIAN after every commit
-                try:
-                    from obsidian_deep_sync import deep_sync_everything
-                    deep_sync_everything()
-                    print("✅ Synced to Obsidian")
-                except Exception as e:
-                    print(f"⚠️ Obsidian sync failed: {e}")
+                # DEEP SYNC TO OBSIDIAN after every commit, overlapped with
+                # the push. Not a daemon thread: the CLI exits right after
+                # auto_commit() and must not cut the sync short.
+                if _HAS_OBSIDIAN:
+                    threading.Thread(target=_sync_to_obsidian).start()
                 
-                if push_result.returncode == 0:
-                    return True
-                else:
-                    print(f"⚠️ Commit saved locally but push failed: {push_result.stderr}")
-                    return True
+                # Push to remote in the background; the commit has already
+                # landed locally, so don't block on the network round-trip.
+                # Own session + DEVNULL lets the push outlive this process.
+                subprocess.Popen(
+                    ["git", "push", "--quiet"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.brain_dir,
+                    start_new_session=True
+                )
+                return True
             
         except Exception as e:
             print(f"❌ Auto-commit error: {e}")
@@ -138,17 +168,8 @@ class AutoCommit:
     
     def force_commit(self, reason: str) -> bool:
         """Force a commit regardless of time"""
-        # Temporarily set last commit to None to force
-        original = self.state["last_commit"]
-        self.state["last_commit"] = None
-        
         message = f"Manual save: {reason}\n\nTriggered by user action"
-        result = self.auto_commit(message)
-        
-        if not result:
-            self.state["last_commit"] = original
-        
-        return result
+        return self.auto_commit(message, force=True)
     
     def status(self) -> str:
         """Get auto-commit status"""
@@ -156,9 +177,7 @@ class AutoCommit:
         status_lines.append("=" * 30)
         
         if self.state["last_commit"]:
-            last = datetime.fromisoformat(self.state["last_commit"])
-            time_since = datetime.now() - last
-            mins = int(time_since.total_seconds() / 60)
+            mins = (int(time.time()) - self.state["last_commit"]) // 60
             
             status_lines.append(f"Last commit: {mins} minutes ago")
             status_lines.append(f"Next commit: in {60 - mins} minutes")
@@ -169,20 +188,76 @@ class AutoCommit:
         status_lines.append(f"Total commits: {self.state['total_commits']}")
         
         # Check for uncommitted changes
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            capture_output=True,
-            text=True,
-            cwd=self.brain_dir
-        )
-        
-        if result.stdout.strip():
-            changes = len(result.stdout.strip().split('\n'))
+        porcelain = self._git_status_porcelain()
+        if porcelain:
+            changes = porcelain.count(b"\0")
             status_lines.append(f"⚠️ Uncommitted changes: {changes} files")
         else:
             status_lines.append("✅ All changes committed")
         
         return "\n".join(status_lines)
+    
+    def _seconds_until_due(self) -> float:
+        """Seconds until the commit interval has elapsed (0 if already due)"""
+        if not self.state["last_commit"]:
+            return 0
+        return max(0, self.state["last_commit"] + self.commit_interval - time.time())
+    
+    def watch(self):
+        """Commit reactively when files change instead of being polled.
+        
+        Uses watchdog (FSEvents on macOS, inotify on Linux) when installed;
+        otherwise falls back to polling auto_commit() every minute.
+        """
+        try:
+            from watchdog.events import PatternMatchingEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            print("⚠️ watchdog not installed, falling back to polling")
+            while True:
+                self.auto_commit()
+                time.sleep(60)
+        
+        lock = threading.Lock()
+        pending = None
+        
+        def commit_pending():
+            nonlocal pending
+            with lock:
+                pending = None
+            # A file event means the tree may have changed since git status
+            # was last cached; don't let a clean result from before hide it
+            self._status_cache = None
+            self.auto_commit()
+        
+        def on_change(event):
+            # One timer per burst: later events ride along with it, and it
+            # never fires before the hourly interval is up
+            nonlocal pending
+            with lock:
+                if pending is None:
+                    delay = max(WATCH_SETTLE, self._seconds_until_due())
+                    pending = threading.Timer(delay, commit_pending)
+                    pending.daemon = True
+                    pending.start()
+        
+        handler = PatternMatchingEventHandler(
+            patterns=WATCH_PATTERNS,
+            ignore_patterns=["*/.git/*"] + [f"*/{name}" for name in WATCH_IGNORE],
+            ignore_directories=True
+        )
+        handler.on_any_event = on_change
+        
+        observer = Observer()
+        observer.schedule(handler, str(self.brain_dir), recursive=True)
+        observer.start()
+        print(f"👀 Watching {self.brain_dir} for changes")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            observer.stop()
+        observer.join()
 
 def main():
     """CLI interface"""
@@ -192,7 +267,7 @@ def main():
     
     if len(sys.argv) < 2:
         print("Auto-Commit System")
-        print("Commands: check | commit | force <reason> | status")
+        print("Commands: check | commit | force <reason> | status | watch")
         sys.exit(1)
     
     cmd = sys.argv[1]
@@ -201,7 +276,7 @@ def main():
         if auto.should_commit():
             print("✅ Auto-commit needed")
             if auto.auto_commit():
-                print("✅ Changes committed and pushed")
+                print("✅ Changes committed, push running in background")
             else:
                 print("❌ Commit failed")
         else:
@@ -209,7 +284,7 @@ def main():
     
     elif cmd == "commit":
         if auto.auto_commit():
-            print("✅ Changes committed and pushed")
+            print("✅ Changes committed, push running in background")
         else:
             print("ℹ️ No changes to commit or not time yet")
     
@@ -223,6 +298,9 @@ def main():
     elif cmd == "status":
         print(auto.status())
     
+    elif cmd == "watch":
+        auto.watch()
+    
     else:
         print(f"Unknown command: {cmd}")
 
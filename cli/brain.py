@@ -4,14 +4,12 @@ Brain System - Centralized Command Center
 All brain functionality in one organized place
 """
 
-import os
-import sys
+from functools import cached_property
 from pathlib import Path
 
-# Add brain directories to path
+# core/ and integrations/ are packages next to this file, which Python
+# already puts on sys.path when brain.py is run or imported from here
 BRAIN_ROOT = Path(__file__).parent
-sys.path.insert(0, str(BRAIN_ROOT / "core"))
-sys.path.insert(0, str(BRAIN_ROOT / "integrations"))
 
 from core.brain import EnhancedXMLBrain
 from integrations.gmail.gmail_hybrid import GmailHybridAnalyzer
@@ -23,17 +21,17 @@ class BrainSystem:
         self.root = BRAIN_ROOT
         self.config_dir = self.root / "config"
         self.data_dir = self.root / "data"
-        
-        # Initialize core brain
-        self.brain = EnhancedXMLBrain()
-        
-        # Initialize Gmail with hybrid approach
-        self.gmail = GmailHybridAnalyzer()
-        
-        print(f"🧠 Brain System Initialized")
-        print(f"   Root: {self.root}")
-        print(f"   Config: {self.config_dir}")
-        print(f"   Data: {self.data_dir}")
+    
+    @cached_property
+    def brain(self) -> EnhancedXMLBrain:
+        """Core brain, built on first use"""
+        return EnhancedXMLBrain()
+    
+    @cached_property
+    def gmail(self) -> GmailHybridAnalyzer:
+        """Gmail with hybrid approach, built on first use so commands that
+        never touch Gmail skip its credential/token setup"""
+        return GmailHybridAnalyzer()
     
     def _load_gmail_token(self):
         """Load Gmail token from config"""
@@ -48,7 +46,6 @@ class BrainSystem:
         token_file.parent.mkdir(parents=True, exist_ok=True)
         token_file.write_text(token)
         self.gmail.access_token = token
-        self.gmail.headers = {"Authorization": f"Bearer {token}"}
         print(f"✅ Gmail token saved to: {token_file}")
         return self.gmail.test_connection()
     
@@ -100,12 +97,40 @@ class BrainSystem:
         return True
 
 
-# Global instance
-brain = BrainSystem()
+def _gmail_auth(brain: BrainSystem):
+    """Authenticate Gmail OAuth"""
+    if hasattr(brain.gmail, 'authenticate'):
+        brain.gmail.authenticate()
+    else:
+        print("Gmail OAuth not available")
+
+
+def _gmail_test(brain: BrainSystem):
+    """Test Gmail connection"""
+    if hasattr(brain.gmail, 'service') and brain.gmail.service:
+        brain.gmail.analyze_job_applications(days_back=1)
+        print("✅ Gmail connection test successful!")
+    else:
+        print("❌ Gmail not connected. Run 'gmail auth' first.")
+
+
+# Interactive commands that take no arguments ("process <text>" is prefix-matched)
+COMMANDS = {
+    "status": BrainSystem.status,
+    "gmail auth": _gmail_auth,
+    "gmail test": _gmail_test,
+    "analyze jobs": BrainSystem.analyze_job_emails,
+}
 
 
 def main():
     """Interactive brain system"""
+    brain = BrainSystem()
+    print(f"🧠 Brain System Initialized")
+    print(f"   Root: {brain.root}")
+    print(f"   Config: {brain.config_dir}")
+    print(f"   Data: {brain.data_dir}")
+    
     print("\n🧠 Brain System - Interactive Mode")
     print("=" * 50)
     print("\nCommands:")
@@ -117,6 +142,11 @@ def main():
     print("  quit            - Exit")
     print()
     
+    try:
+        import readline  # noqa: F401 - gives input() history and line editing
+    except ImportError:
+        pass
+    
     while True:
         try:
             cmd = input("brain> ").strip()
@@ -127,30 +157,13 @@ def main():
             if cmd == "quit":
                 break
             
-            elif cmd == "status":
-                brain.status()
-            
-            elif cmd == "gmail auth":
-                if hasattr(brain.gmail, 'authenticate'):
-                    brain.gmail.authenticate()
-                else:
-                    print("Gmail OAuth not available")
-            
-            elif cmd == "gmail test":
-                if hasattr(brain.gmail, 'service') and brain.gmail.service:
-                    analysis = brain.gmail.analyze_job_applications(days_back=1)
-                    print("✅ Gmail connection test successful!")
-                else:
-                    print("❌ Gmail not connected. Run 'gmail auth' first.")
-            
-            elif cmd == "analyze jobs":
-                brain.analyze_job_emails()
-            
+            handler = COMMANDS.get(cmd)
+            if handler:
+                handler(brain)
             elif cmd.startswith("process "):
                 text = cmd[8:]
                 result = brain.process(text)
                 print(f"Result: {result}")
-            
             else:
                 print(f"Unknown command: {cmd}")
         
@@ -7,17 +7,101 @@ Uses existing Gmail integration to extract specific information
 import sys
 import os
 import re
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for http2=True
+    _HAS_HTTP2 = True
+except ImportError:
+    _HAS_HTTP2 = False
+
 # Add brain system to path
 BRAIN_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(BRAIN_ROOT))
 sys.path.insert(0, str(BRAIN_ROOT / "integrations"))
 
-from gmail_hybrid import GmailHybridAnalyzer
+from gmail_hybrid import MESSAGE_FIELDS, GmailHybridAnalyzer, compile_keywords, json_loads, keyword_hits
+
+GMAIL_MESSAGES_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages"
+SEARCH_WORKERS = 8  # searches are independent network calls, run them together
+# Google APIs only gzip responses for clients whose User-Agent says "gzip"
+USER_AGENT = "brain-email-analyzer (gzip)"
+# Delivered message content never changes, so fetched messages are kept for
+# a month (per fields mask); search results only for an hour since new mail
+# keeps arriving. The file holds message bodies, so it is owner-only.
+CACHE_DB = Path.home() / ".cache" / "brain" / "gmail_msgs.sqlite"
+SEARCH_CACHE_TTL = 3600
+MESSAGE_CACHE_TTL = 30 * 24 * 3600
+
+# Extractor patterns, compiled once instead of per message
+_AMOUNT_RE = re.compile(r'\$([0-9,]+(?:\.[0-9]{2})?)')
+_MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+           'august', 'september', 'october', 'november', 'december')
+# Extractor patterns are searched one by one, in order: fused into a single
+# alternation, a match for one pattern consumes text another would have
+# matched (e.g. 'valid 1/2/2025, expires 3/4/2025' loses the second date).
+# Each pattern has exactly one capture group.
+_EXPIRY_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'expir.*?(\d{1,2}/\d{1,2}/\d{2,4})',
+    r'valid until.*?(\d{1,2}/\d{1,2}/\d{2,4})',
+    r'deadline.*?(\d{1,2}/\d{1,2}/\d{2,4})',
+    r'ends on.*?(\d{1,2}/\d{1,2}/\d{2,4})',
+    r'(\d{1,2}/\d{1,2}/\d{2,4}).*?expir',
+    rf"((?:{'|'.join(_MONTHS)})\s+\d{{1,2}},?\s+\d{{4}})"
+))
+# The first pattern that matches anywhere wins, not the leftmost match
+_QUOTA_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'quota.*?(\d+)',
+    r'limit.*?(\d+)',
+    r'usage.*?(\d+)',
+    r'remaining.*?(\d+)',
+    r'(\d+).*?tpu.*?hours?'
+))
+
+# TPU relevance gate plus info types in priority order. The same scan also
+# reports the literals the expiry/quota alternations cannot match without,
+# so those backtracking patterns only run on messages that could hit.
+_TPU_TYPES = ('expiration', 'quota', 'credit_info')
+_TPU_SCANNER = compile_keywords({
+    'relevant': ['credit', 'quota', 'tpu', 'research grant', 'academic credit'],
+    'expiration': ['expir', 'deadline', 'valid until', 'ends on'],
+    'quota': ['quota', 'limit', 'allocation'],
+    'credit_info': ['credit', 'grant', 'awarded'],
+    'date_slash': ['/'],
+    'month': list(_MONTHS),
+    'quota_value': ['quota', 'limit', 'usage', 'remaining', 'tpu'],
+})
+
+# Job email categories in priority order: when several hit, the first wins
+_JOB_CATEGORY_KEYWORDS = {
+    'offers': ['offer', 'congratulations', 'pleased to offer', 'job offer'],
+    'interviews_scheduled': ['interview', 'call', 'meeting', 'schedule', 'phone screen', 'technical interview', 'onsite'],
+    'rejections': ['unfortunately', 'not moving forward', 'other candidate', 'declined', 'regret', 'not selected'],
+    'acknowledgments': ['thank you for your application', 'received your application', 'reviewing your', 'under consideration'],
+    'follow_ups': ['follow up', 'checking in', 'status update', 'any updates'],
+    'pending': ['next steps', 'move forward', 'proceed', 'continue'],
+    'applications_sent': ['application', 'apply', 'position', 'role', 'opportunity'],
+}
+_JOB_CATEGORIES = tuple(_JOB_CATEGORY_KEYWORDS)
+_JOB_CATEGORY_RE, _JOB_PHRASE_LABELS = compile_keywords(_JOB_CATEGORY_KEYWORDS)
+# Each phrase resolves straight to the best-ranked category it implies
+_JOB_PHRASE_RANK = {
+    phrase: min(map(_JOB_CATEGORIES.index, labels))
+    for phrase, labels in _JOB_PHRASE_LABELS.items()
+}
 
 class ComprehensiveEmailAnalyzer:
     """Analyzes emails for specific information like TPU credits and job applications"""
@@ -25,6 +109,144 @@ class ComprehensiveEmailAnalyzer:
     def __init__(self):
         self.gmail = GmailHybridAnalyzer()
         
+        # Authorization is not a session header: it is read from self.gmail
+        # per request, so tokens refreshed by either session are picked up
+        headers = {
+            "Accept-Encoding": "gzip",
+            "User-Agent": USER_AGENT,
+        }
+        if _HAS_HTTP2:
+            # One HTTP/2 connection multiplexes all the concurrent searches
+            # (httpx retries only failed connects, not error statuses)
+            transport = httpx.HTTPTransport(http2=True, retries=3)
+            self.session = httpx.Client(transport=transport, headers=headers, timeout=30)
+        else:
+            # Keep-alive connections shared by the concurrent searches, riding
+            # out Gmail's rate limiting (429) and transient 5xx with backoff
+            self.session = requests.Session()
+            self.session.headers.update(headers)
+            retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(pool_connections=SEARCH_WORKERS, pool_maxsize=SEARCH_WORKERS, max_retries=retry)
+            self.session.mount("https://", adapter)
+        
+        self._refresh_lock = threading.Lock()
+        
+        self.cache_db = CACHE_DB
+        self.setup_cache()
+    
+    def setup_cache(self):
+        """Initialize the on-disk message and search cache, dropping
+        entries older than their TTL"""
+        self.cache_db.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.cache_db.touch(mode=0o600)
+        os.chmod(self.cache_db, 0o600)  # touch() leaves an existing file's mode alone
+        with sqlite3.connect(self.cache_db) as conn:
+            # Superseded by message_cache, which is keyed by fields mask too
+            conn.execute("DROP TABLE IF EXISTS messages")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS message_cache (
+                    id TEXT NOT NULL,
+                    fields TEXT NOT NULL,  -- MESSAGE_FIELDS the resource was fetched with
+                    fetched_at REAL NOT NULL,
+                    data TEXT NOT NULL,  -- JSON message resource
+                    PRIMARY KEY (id, fields)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS searches (
+                    query TEXT PRIMARY KEY,  -- maxResults + full q string
+                    fetched_at REAL NOT NULL,
+                    messages TEXT NOT NULL  -- JSON list of {id, threadId}
+                )
+            """)
+            now = time.time()
+            conn.execute("DELETE FROM message_cache WHERE fetched_at < ?", (now - MESSAGE_CACHE_TTL,))
+            conn.execute("DELETE FROM searches WHERE fetched_at < ?", (now - SEARCH_CACHE_TTL,))
+    
+    def _get(self, url: str, **kwargs):
+        """GET with the Gmail analyzer's current token; a 401 refreshes the
+        token once (shared by concurrent callers) and retries"""
+        token = self.gmail.access_token
+        response = self.session.get(url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        if response.status_code != 401:
+            return response
+        
+        with self._refresh_lock:
+            # Another search may already have refreshed past the token we sent
+            refreshed = self.gmail.access_token != token or self.gmail.refresh_access_token()
+        if not refreshed:
+            return response
+        return self.session.get(url, headers={"Authorization": f"Bearer {self.gmail.access_token}"}, **kwargs)
+    
+    def _search_messages(self, queries: List[str], days_back: int, max_results: int) -> List[Dict]:
+        """Run Gmail searches concurrently; results keep the order of queries.
+        Searches answered within SEARCH_CACHE_TTL are served from the cache."""
+        after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
+        keys = [f'{max_results}:after:{after_date} ({query})' for query in queries]
+        
+        with sqlite3.connect(self.cache_db) as conn:
+            rows = conn.execute(
+                f"SELECT query, messages FROM searches WHERE fetched_at > ? AND query IN ({','.join('?' * len(keys))})",
+                [time.time() - SEARCH_CACHE_TTL, *keys]
+            )
+            results = {key: json_loads(messages) for key, messages in rows}
+        
+        def search(key: str) -> List[Dict]:
+            response = self._get(
+                GMAIL_MESSAGES_URL,
+                params={'q': key.split(':', 1)[1], 'maxResults': max_results}
+            )
+            response.raise_for_status()
+            return json_loads(response.content).get('messages', [])
+        
+        missing = [key for key in keys if key not in results]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(missing))) as pool:
+                results.update(zip(missing, pool.map(search, missing)))
+            with sqlite3.connect(self.cache_db) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO searches VALUES (?, ?, ?)",
+                    [(key, time.time(), json.dumps(results[key])) for key in missing]
+                )
+        
+        return [msg for key in keys for msg in results[key]]
+    
+    def _get_messages(self, message_ids: List[str]) -> Iterator[Dict]:
+        """Yield message resources for message_ids; only ids not already
+        cached on disk are fetched (in one batch request).
+        
+        The batch fetch runs in the background while the cached messages are
+        yielded, so the caller's per-message parsing overlaps the network
+        round-trip. Cached messages therefore come first, then fetched ones,
+        each group in the order of message_ids.
+        """
+        with sqlite3.connect(self.cache_db) as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM message_cache WHERE fields = ? AND fetched_at > ? "
+                f"AND id IN ({','.join('?' * len(message_ids))})",
+                [MESSAGE_FIELDS, time.time() - MESSAGE_CACHE_TTL, *message_ids]
+            )
+            cached = {msg_id: json_loads(data) for msg_id, data in rows}
+        missing = [msg_id for msg_id in message_ids if msg_id not in cached]
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self.gmail.batch_get_messages, missing, params={'fields': MESSAGE_FIELDS})
+            
+            for msg_id in message_ids:
+                if msg_id in cached:
+                    yield cached[msg_id]
+            
+            fetched = pending.result()
+        
+        if fetched:
+            with sqlite3.connect(self.cache_db) as conn:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO message_cache VALUES (?, ?, ?, ?)",
+                    [(msg['id'], MESSAGE_FIELDS, now, json.dumps(msg)) for msg in fetched]
+                )
+        yield from fetched
+        
     def search_tpu_credits(self, days_back: int = 180) -> Dict:
         """Search for TPU quota and credit related emails"""
         print("🔍 Searching for TPU credit information...")
@@ -33,8 +255,6 @@ class ComprehensiveEmailAnalyzer:
             return {"error": "No Gmail access token available"}
         
         try:
-            headers = {"Authorization": f"Bearer {self.gmail.access_token}"}
-            
             # Search for TPU, quota, credit related emails
             tpu_queries = [
                 'tpu OR "tensor processing unit"',
@@ -45,31 +265,10 @@ class ComprehensiveEmailAnalyzer:
                 'expir OR deadline OR "valid until"'
             ]
             
-            all_tpu_messages = []
+            all_tpu_messages = self._search_messages(tpu_queries, days_back, max_results=20)
             
-            for query in tpu_queries:
-                # Calculate date filter
-                after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-                full_query = f'after:{after_date} ({query})'
-                
-                import requests
-                response = requests.get(
-                    "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-                    headers=headers,
-                    params={'q': full_query, 'maxResults': 20}
-                )
-                response.raise_for_status()
-                
-                messages = response.json().get('messages', [])
-                all_tpu_messages.extend(messages)
-            
-            # Remove duplicates
-            unique_messages = []
-            seen_ids = set()
-            for msg in all_tpu_messages:
-                if msg['id'] not in seen_ids:
-                    unique_messages.append(msg)
-                    seen_ids.add(msg['id'])
+            # Remove duplicates; dict keys keep first-seen order
+            unique_messages = list({msg['id']: msg for msg in all_tpu_messages}.values())
             
             print(f"Found {len(unique_messages)} potentially relevant emails")
             
@@ -82,33 +281,34 @@ class ComprehensiveEmailAnalyzer:
                 'recommendations': []
             }
             
-            for msg in unique_messages[:15]:  # Analyze first 15 messages
-                msg_response = requests.get(
-                    f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{msg['id']}",
-                    headers=headers
-                )
-                msg_response.raise_for_status()
-                msg_data = msg_response.json()
-                
+            # Analyze first 15 messages; uncached ones are fetched in one batch request
+            # that overlaps with parsing the cached ones
+            batch_ids = [msg['id'] for msg in unique_messages[:15]]
+            for msg_data in self._get_messages(batch_ids):
                 # Extract email details
-                headers_data = {h['name']: h['value'] for h in msg_data['payload'].get('headers', [])}
-                subject = headers_data.get('Subject', '')
-                sender = headers_data.get('From', '')
-                date = headers_data.get('Date', '')
+                headers_data = self.gmail._extract_headers(msg_data)
+                subject = headers_data.get('subject', '')
+                sender = headers_data.get('from', '')
+                date = headers_data.get('date', '')
                 body = self.gmail._get_message_body(msg_data)
                 
+                # Build the scanned text once and run one keyword scan over it
+                # that every extractor below reads from
+                text = subject + ' ' + body
+                hits = keyword_hits(_TPU_SCANNER, text.lower())
+                
                 # Look for credit/quota information
-                credit_info = self._extract_tpu_info(subject, body, sender, date)
+                credit_info = self._extract_tpu_info(hits, subject, body, sender, date)
                 if credit_info:
                     tpu_findings['credit_info'].append(credit_info)
                 
                 # Look for expiration dates
-                expiry = self._extract_expiration_dates(subject, body)
+                expiry = self._extract_expiration_dates(text, hits)
                 if expiry:
                     tpu_findings['expiration_dates'].extend(expiry)
                 
                 # Look for quota information
-                quota = self._extract_quota_info(subject, body)
+                quota = self._extract_quota_info(text, hits)
                 if quota:
                     tpu_findings['quota_info'].append(quota)
             
@@ -129,8 +329,6 @@ class ComprehensiveEmailAnalyzer:
             return {"error": "No Gmail access token available"}
         
         try:
-            headers = {"Authorization": f"Bearer {self.gmail.access_token}"}
-            
             # More comprehensive job search queries
             job_queries = [
                 'application OR applied OR "thank you for applying"',
@@ -142,30 +340,10 @@ class ComprehensiveEmailAnalyzer:
                 'feedback OR "interview feedback" OR assessment'
             ]
             
-            all_job_messages = []
+            all_job_messages = self._search_messages(job_queries, days_back, max_results=25)
             
-            for query in job_queries:
-                after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-                full_query = f'after:{after_date} ({query})'
-                
-                import requests
-                response = requests.get(
-                    "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-                    headers=headers,
-                    params={'q': full_query, 'maxResults': 25}
-                )
-                response.raise_for_status()
-                
-                messages = response.json().get('messages', [])
-                all_job_messages.extend(messages)
-            
-            # Remove duplicates
-            unique_messages = []
-            seen_ids = set()
-            for msg in all_job_messages:
-                if msg['id'] not in seen_ids:
-                    unique_messages.append(msg)
-                    seen_ids.add(msg['id'])
+            # Remove duplicates; dict keys keep first-seen order
+            unique_messages = list({msg['id']: msg for msg in all_job_messages}.values())
             
             print(f"Found {len(unique_messages)} job-related emails")
             
@@ -173,7 +351,7 @@ class ComprehensiveEmailAnalyzer:
             job_stats = {
                 'total_job_emails': len(unique_messages),
                 'time_period': f'last {days_back} days',
-                'companies': set(),
+                'companies': [],
                 'detailed_breakdown': {
                     'applications_sent': 0,
                     'acknowledgments': 0,
@@ -188,31 +366,29 @@ class ComprehensiveEmailAnalyzer:
                 'next_actions': []
             }
             
-            for msg in unique_messages[:30]:  # Analyze more messages
-                msg_response = requests.get(
-                    f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{msg['id']}",
-                    headers=headers
-                )
-                msg_response.raise_for_status()
-                msg_data = msg_response.json()
+            # Analyze more messages; uncached ones are fetched in one batch request
+            # that overlaps with parsing the cached ones
+            batch_ids = [msg['id'] for msg in unique_messages[:30]]
+            for msg_data in self._get_messages(batch_ids):
+                headers_data = self.gmail._extract_headers(msg_data)
+                subject = headers_data.get('subject', '')
+                sender = headers_data.get('from', '')
+                date = headers_data.get('date', '')
                 
-                headers_data = {h['name']: h['value'] for h in msg_data['payload'].get('headers', [])}
-                subject = headers_data.get('Subject', '')
-                sender = headers_data.get('From', '')
-                date = headers_data.get('Date', '')
-                body = self.gmail._get_message_body(msg_data)
-                
-                # Enhanced categorization
-                category = self._categorize_job_email(subject, body, sender)
+                # Enhanced categorization. The snippet is checked first: when
+                # no job keyword shows up in subject, snippet or sender the
+                # body is never decoded and the email stays pending
+                if _JOB_CATEGORY_RE.search((subject + ' ' + msg_data.get('snippet', '') + ' ' + sender).lower()):
+                    body = self.gmail._get_message_body(msg_data)
+                    category = self._categorize_job_email((subject + ' ' + body + ' ' + sender).lower())
+                else:
+                    category = 'pending'
                 job_stats['detailed_breakdown'][category] += 1
                 
                 # Extract company info
                 company = self.gmail._extract_company(sender, subject)
                 if company:
-                    job_stats['companies'].add(company)
-                    if company not in job_stats['company_responses']:
-                        job_stats['company_responses'][company] = []
-                    job_stats['company_responses'][company].append({
+                    job_stats['company_responses'].setdefault(company, []).append({
                         'type': category,
                         'date': date,
                         'subject': subject[:100]
@@ -226,14 +402,11 @@ class ComprehensiveEmailAnalyzer:
                     'subject': subject[:80]
                 })
             
-            # Convert sets to lists for JSON serialization
-            job_stats['companies'] = list(job_stats['companies'])
+            # company_responses is keyed by company in first-seen order
+            job_stats['companies'] = list(job_stats['company_responses'])
             
-            # Sort timeline by date
-            try:
-                job_stats['timeline'].sort(key=lambda x: self._parse_email_date(x['date']), reverse=True)
-            except:
-                pass  # Keep original order if date parsing fails
+            # Sort timeline by date, newest first
+            job_stats['timeline'].sort(key=lambda x: self._parse_email_date(x['date']), reverse=True)
             
             # Generate next actions
             job_stats['next_actions'] = self._generate_job_recommendations(job_stats)
@@ -244,71 +417,46 @@ class ComprehensiveEmailAnalyzer:
             print(f"❌ Error analyzing job emails: {e}")
             return {"error": str(e)}
     
-    def _extract_tpu_info(self, subject: str, body: str, sender: str, date: str) -> Optional[Dict]:
-        """Extract TPU credit and quota information from email"""
-        text = (subject + ' ' + body).lower()
-        
-        credit_keywords = ['credit', 'quota', 'tpu', 'research grant', 'academic credit']
-        if not any(keyword in text for keyword in credit_keywords):
+    def _extract_tpu_info(self, hits: set, subject: str, body: str, sender: str, date: str) -> Optional[Dict]:
+        """Extract TPU credit and quota information from email.
+        hits are the _TPU_SCANNER labels of the lowercased subject + body."""
+        # The keyword scan answers both the relevance check and the type
+        if 'relevant' not in hits:
             return None
         
         info = {
             'sender': sender,
             'date': date,
             'subject': subject,
-            'type': 'unknown'
+            'type': next((kind for kind in _TPU_TYPES if kind in hits), 'unknown')
         }
         
-        # Determine type of TPU info
-        if any(word in text for word in ['expir', 'deadline', 'valid until', 'ends on']):
-            info['type'] = 'expiration'
-        elif any(word in text for word in ['quota', 'limit', 'allocation']):
-            info['type'] = 'quota'
-        elif any(word in text for word in ['credit', 'grant', 'awarded']):
-            info['type'] = 'credit_info'
-        
         # Try to extract specific amounts or dates
-        amount_match = re.search(r'\$([0-9,]+(?:\.[0-9]{2})?)', body)
+        amount_match = _AMOUNT_RE.search(body)
         if amount_match:
             info['amount'] = amount_match.group(1)
         
         return info
     
-    def _extract_expiration_dates(self, subject: str, body: str) -> List[str]:
-        """Extract expiration dates from email content"""
-        text = subject + ' ' + body
+    def _extract_expiration_dates(self, text: str, hits: set) -> List[str]:
+        """Extract expiration dates from email content (subject + body)"""
+        # Every date pattern needs a '/' or a month name
+        if 'date_slash' not in hits and 'month' not in hits:
+            return []
         
         # Look for various date patterns
-        date_patterns = [
-            r'expir.*?(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'valid until.*?(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'deadline.*?(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'ends on.*?(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'(\d{1,2}/\d{1,2}/\d{2,4}).*?expir',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}'
-        ]
-        
         dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            dates.extend(matches)
-        
+        for pattern in _EXPIRY_PATTERNS:
+            dates.extend(pattern.findall(text))
         return dates
     
-    def _extract_quota_info(self, subject: str, body: str) -> Optional[Dict]:
-        """Extract quota/usage information"""
-        text = subject + ' ' + body
-        
-        quota_patterns = [
-            r'quota.*?(\d+)',
-            r'limit.*?(\d+)',
-            r'usage.*?(\d+)',
-            r'remaining.*?(\d+)',
-            r'(\d+).*?tpu.*?hours?'
-        ]
-        
-        for pattern in quota_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+    def _extract_quota_info(self, text: str, hits: set) -> Optional[Dict]:
+        """Extract quota/usage information from subject + body"""
+        if 'quota_value' not in hits:
+            return None
+        
+        for pattern in _QUOTA_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return {
                     'value': match.group(1),
@@ -317,36 +465,24 @@ class ComprehensiveEmailAnalyzer:
         
         return None
     
-    def _categorize_job_email(self, subject: str, body: str, sender: str) -> str:
-        """Enhanced job email categorization"""
-        text = (subject + ' ' + body + ' ' + sender).lower()
-        
-        # More specific categorization
-        if any(phrase in text for phrase in ['offer', 'congratulations', 'pleased to offer', 'job offer']):
-            return 'offers'
-        elif any(phrase in text for phrase in ['interview', 'call', 'meeting', 'schedule', 'phone screen', 'technical interview', 'onsite']):
-            return 'interviews_scheduled'
-        elif any(phrase in text for phrase in ['unfortunately', 'not moving forward', 'other candidate', 'declined', 'regret', 'not selected']):
-            return 'rejections'
-        elif any(phrase in text for phrase in ['thank you for your application', 'received your application', 'reviewing your', 'under consideration']):
-            return 'acknowledgments'
-        elif any(phrase in text for phrase in ['follow up', 'checking in', 'status update', 'any updates']):
-            return 'follow_ups'
-        elif any(phrase in text for phrase in ['next steps', 'move forward', 'proceed', 'continue']):
-            return 'pending'
-        elif any(word in text for word in ['application', 'apply', 'position', 'role', 'opportunity']):
-            return 'applications_sent'
-        else:
-            return 'pending'
+    def _categorize_job_email(self, text_lc: str) -> str:
+        """Enhanced job email categorization of lowercased subject + body + sender"""
+        # More specific categorization: one overlapping scan keeps the best
+        # rank seen and stops early once the top category has matched
+        best = len(_JOB_CATEGORIES)
+        for match in _JOB_CATEGORY_RE.finditer(text_lc):
+            best = min(best, _JOB_PHRASE_RANK[match.group(1)])
+            if best == 0:
+                break
+        return _JOB_CATEGORIES[best] if best < len(_JOB_CATEGORIES) else 'pending'
     
-    def _parse_email_date(self, date_str: str) -> datetime:
-        """Parse email date string to datetime object"""
+    def _parse_email_date(self, date_str: str) -> float:
+        """Parse email date string to a POSIX timestamp; unparseable dates
+        sort as oldest instead of aborting the whole sort"""
         try:
-            # Handle various email date formats
-            import email.utils
-            return datetime.fromtimestamp(email.utils.mktime_tz(email.utils.parsedate_tz(date_str)))
-        except:
-            return datetime.now()  # Fallback
+            return parsedate_to_datetime(date_str).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
     
     def _generate_tpu_recommendations(self, findings: Dict) -> List[str]:
         """Generate recommendations based on TPU findings"""
@@ -393,54 +529,60 @@ class ComprehensiveEmailAnalyzer:
         return recommendations
 
 
+def format_tpu_report(tpu_info: Dict) -> str:
+    """Format TPU credit findings for display"""
+    lines = ["\n🔍 TPU Credit Analysis:", "-" * 30]
+    if 'error' in tpu_info:
+        lines.append(f"❌ Error: {tpu_info['error']}")
+        return "\n".join(lines)
+    
+    lines.append(f"📧 Total messages analyzed: {tpu_info['total_messages']}")
+    lines.append(f"💰 Credit info found: {len(tpu_info['credit_info'])}")
+    lines.append(f"📅 Expiration dates found: {len(tpu_info['expiration_dates'])}")
+    
+    if tpu_info['expiration_dates']:
+        lines.append("⚠️ Expiration dates found:")
+        lines.extend(f"   • {date}" for date in tpu_info['expiration_dates'][:3])
+    
+    lines.extend(f"   {rec}" for rec in tpu_info['recommendations'])
+    return "\n".join(lines)
+
+
+def format_job_report(job_stats: Dict) -> str:
+    """Format job response analysis for display"""
+    lines = ["\n📊 Job Application Analysis:", "-" * 30]
+    if 'error' in job_stats:
+        lines.append(f"❌ Error: {job_stats['error']}")
+        return "\n".join(lines)
+    
+    lines.append(f"📧 Total job emails: {job_stats['total_job_emails']}")
+    lines.append(f"🏢 Companies: {len(job_stats['companies'])}")
+    lines.append(f"📅 Time period: {job_stats['time_period']}")
+    
+    lines.append("\n📈 Breakdown:")
+    lines.extend(
+        f"   {category.replace('_', ' ').title()}: {count}"
+        for category, count in job_stats['detailed_breakdown'].items() if count > 0
+    )
+    
+    lines.append("\n🎯 Next Actions:")
+    lines.extend(f"   {action}" for action in job_stats['next_actions'])
+    return "\n".join(lines)
+
+
 def main():
     """Run comprehensive email analysis"""
     analyzer = ComprehensiveEmailAnalyzer()
     
-    print("🧠 Comprehensive Email Analysis Starting...")
-    print("=" * 60)
+    print("🧠 Comprehensive Email Analysis Starting...\n" + "=" * 60)
     
     # Search for TPU credit information
     tpu_info = analyzer.search_tpu_credits()
-    
-    print("\n🔍 TPU Credit Analysis:")
-    print("-" * 30)
-    if 'error' in tpu_info:
-        print(f"❌ Error: {tpu_info['error']}")
-    else:
-        print(f"📧 Total messages analyzed: {tpu_info['total_messages']}")
-        print(f"💰 Credit info found: {len(tpu_info['credit_info'])}")
-        print(f"📅 Expiration dates found: {len(tpu_info['expiration_dates'])}")
-        
-        if tpu_info['expiration_dates']:
-            print("⚠️ Expiration dates found:")
-            for date in tpu_info['expiration_dates'][:3]:
-                print(f"   • {date}")
-        
-        for rec in tpu_info['recommendations']:
-            print(f"   {rec}")
+    print(format_tpu_report(tpu_info))
     
     # Analyze job applications
     job_stats = analyzer.analyze_job_responses()
-    
-    print("\n📊 Job Application Analysis:")
-    print("-" * 30)
-    if 'error' in job_stats:
-        print(f"❌ Error: {job_stats['error']}")
-    else:
-        print(f"📧 Total job emails: {job_stats['total_job_emails']}")
-        print(f"🏢 Companies: {len(job_stats['companies'])}")
-        print(f"📅 Time period: {job_stats['time_period']}")
-        
-        print("\n📈 Breakdown:")
-        breakdown = job_stats['detailed_breakdown']
-        for category, count in breakdown.items():
-            if count > 0:
-                print(f"   {category.replace('_', ' ').title()}: {count}")
-        
-        print("\n🎯 Next Actions:")
-        for action in job_stats['next_actions']:
-            print(f"   {action}")
+    print(format_job_report(job_stats))
     
     return tpu_info, job_stats
 
@@ -6,12 +6,135 @@ Bypasses Google verification requirements
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import base64
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from email.header import Header
+from email.parser import BytesParser
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 import re
 
+try:
+    import orjson
+    json_loads = orjson.loads  # parses response bytes directly, several times faster
+except ImportError:
+    json_loads = json.loads
+
+def compile_keywords(groups: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, frozenset]]:
+    """Compile labelled keyword lists into one scanner: an alternation over
+    every phrase (longest first) inside a lookahead, and a phrase -> labels map.
+    The lookahead consumes nothing, so the scan tries every position and a
+    phrase starting inside an earlier match is still found. At each position
+    only the longest phrase is reported, so a phrase also carries the labels of
+    the shorter phrases inside it; together the scan reports the same labels as
+    testing every phrase with `in`."""
+    phrases = sorted({p for ps in groups.values() for p in ps}, key=len, reverse=True)
+    labels = {
+        phrase: frozenset(label for label, ps in groups.items() if any(p in phrase for p in ps))
+        for phrase in phrases
+    }
+    return re.compile('(?=(' + '|'.join(map(re.escape, phrases)) + '))'), labels
+
+def keyword_hits(scanner: Tuple[re.Pattern, Dict[str, frozenset]], text: str) -> set:
+    """Labels of every keyword found in text, in one pass"""
+    pattern, labels = scanner
+    hits = set()
+    for match in pattern.finditer(text):
+        hits |= labels[match.group(1)]
+    return hits
+
+# Message categories in priority order: when several hit, the first wins
+_CATEGORIES = ('interviews', 'rejections', 'replies', 'applications')
+_CATEGORY_SCANNER = compile_keywords({
+    'interviews': ['interview', 'call', 'meeting', 'schedule', 'calendar', 'zoom', 'phone screen'],
+    'rejections': ['unfortunately', 'not moving forward', 'other candidate', 'declined', 'regret'],
+    # Automated acknowledgments
+    'replies': ['thank you for your', 'received your application', 'reviewing your', 'noreply', 'no-reply'],
+    'applications': ['application', 'apply', 'position', 'role', 'opportunity', 'opening'],
+})
+# Company patterns, compiled once instead of per message
+_EMAIL_DOMAIN_RE = re.compile(r'@([^.]+)\.')
+_SENDER_NAME_RE = re.compile(r'^([^<@]+)')
+_AT_COMPANY_RE = re.compile(r'\bat\s+([A-Z][a-zA-Z]+)')
+# Common email providers: their domain says nothing about the company
+_GENERIC_DOMAINS = frozenset({'gmail', 'yahoo', 'outlook', 'hotmail', 'icloud', 'noreply', 'mail'})
+_DOMAIN_NOISE_RE = re.compile('careers|jobs|mail')
+_GENERIC_SENDER_RE = re.compile('recruiting|talent|hr|careers|jobs|team')
+
+GMAIL_MESSAGES_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages"
+GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+# Partial response: only what _extract_headers and _get_message_body read,
+# which leaves out attachment metadata, label ids and the raw size fields
+# (parts are spelled out three levels deep to reach nested multiparts)
+MESSAGE_FIELDS = (
+    'id,snippet,payload(headers,body/data,'
+    'parts(mimeType,body/data,parts(mimeType,body/data,parts(mimeType,body/data))))'
+)
+# Columns of analysis['messages']: one list per field, index i is message i
+MESSAGE_COLUMNS = ('id', 'subject', 'sender', 'date', 'type', 'company')
+BODY_LIMIT = 1000  # chars of body text kept for categorization
+# Gmail accepts 100 calls per batch but rate-limits batches above ~50
+GMAIL_BATCH_SIZE = 50
+# Concurrent single GETs when the batch endpoint is unavailable, kept under
+# Gmail's per-user concurrency limit
+GMAIL_FETCH_WORKERS = 10
+# A successful test_connection is trusted for this long, across processes,
+# unless a request comes back 401 in the meantime
+VALIDATION_TTL = 300
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+# OAuth Playground access tokens last an hour; treat them as stale a
+# minute early so a call never starts with a token about to expire
+PLAYGROUND_TOKEN_LIFETIME = 3600
+TOKEN_EXPIRY_MARGIN = 60
+
+def _decode_body(data: str) -> str:
+    """Text of a base64url-encoded message part"""
+    return base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+
+def _header_value(value: str) -> str:
+    """Single-line header value, RFC 2047-encoded only when not plain ASCII"""
+    value = ' '.join(value.splitlines())
+    return value if value.isascii() else Header(value, 'utf-8').encode()
+
+@lru_cache(maxsize=1024)
+def _company_from_sender(sender: str) -> Optional[str]:
+    """Company name for a From header, memoized per sender"""
+    # Extract from sender email domain
+    email_match = _EMAIL_DOMAIN_RE.search(sender)
+    if email_match:
+        domain = email_match.group(1)
+        # Skip common email providers
+        if domain not in _GENERIC_DOMAINS:
+            # Clean up common prefixes
+            domain = _DOMAIN_NOISE_RE.sub('', domain)
+            if len(domain) > 2:
+                return domain.title()
+    
+    # Extract from sender name
+    name_match = _SENDER_NAME_RE.search(sender)
+    if name_match:
+        name = name_match.group(1).strip()
+        # Skip generic recruiting terms
+        if not _GENERIC_SENDER_RE.search(name.lower()):
+            # Extract company name from formats like "John at CompanyName"
+            at_match = _AT_COMPANY_RE.search(name)
+            if at_match:
+                return at_match.group(1)
+            
+            # Use first part if it looks like a company
+            words = name.split()
+            if words and len(words[0]) > 3 and words[0][0].isupper():
+                return words[0]
+    
+    return None
+
 class GmailHybridAnalyzer:
     """Gmail integration using OAuth Playground tokens with credentials"""
     
@@ -26,22 +149,72 @@ class GmailHybridAnalyzer:
             self.credentials_path = self._find_credentials_file()
         
         self.token_path = self.config_dir / "gmail_playground_token.txt"
+        self.validation_path = self.config_dir / "gmail_token_validation.json"
+        
+        # Keep-alive connections shared by every Gmail call; the pool is
+        # sized for the concurrent fallback fetches
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+        self.session.hooks['response'].append(self._handle_401)
+        # Concurrent 401s share one token refresh
+        self._refresh_lock = threading.Lock()
         
         self.credentials = self._load_credentials()
+        self.refresh_token = None
+        self.expires_at = None  # epoch seconds, None when unknown
         self.access_token = self._load_token()
         
         print(f"📧 Gmail Hybrid initialized")
         print(f"   Credentials: {self.credentials_path.name if self.credentials_path.exists() else 'Not found'}")
         print(f"   Token: {'✅ Found' if self.access_token else '❌ Not found'}")
     
+    @property
+    def access_token(self) -> Optional[str]:
+        """Current OAuth access token"""
+        return self._access_token
+    
+    @access_token.setter
+    def access_token(self, token: Optional[str]):
+        # Keep the session's Authorization header in step with the token
+        self._access_token = token
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        else:
+            self.session.headers.pop("Authorization", None)
+    
     def _find_credentials_file(self) -> Path:
-        """Find the credentials JSON file"""
-        for file_path in self.config_dir.glob("*.json"):
+        """Find the credentials JSON file.
+        
+        The last file found is remembered in .credentials_ptr, so later
+        runs skip the directory scan while that file still exists.
+        """
+        pointer = self.config_dir / ".credentials_ptr"
+        try:
+            cached = Path(pointer.read_text().strip())
+            if cached.exists():
+                return cached
+        except OSError:
+            pass
+        
+        found = self._scan_credentials_files()
+        if found:
+            try:
+                pointer.write_text(str(found))
+            except OSError:
+                pass  # Pointer is only a cache
+            return found
+        
+        return self.config_dir / "credentials.json"
+    
+    def _scan_credentials_files(self) -> Optional[Path]:
+        """Look through config_dir for an OAuth client JSON"""
+        json_files = sorted(self.config_dir.glob("*.json"))
+        for file_path in json_files:
             if "client_secret" in file_path.name or "credentials" in file_path.name:
                 return file_path
         
         # If not found, look for any JSON file with OAuth credentials
-        for json_file in self.config_dir.glob("*.json"):
+        for json_file in json_files:
             try:
                 with open(json_file, 'r') as f:
                     data = json.load(f)
@@ -50,7 +223,7 @@ class GmailHybridAnalyzer:
             except:
                 continue
         
-        return self.config_dir / "credentials.json"
+        return None
     
     def _load_credentials(self) -> Optional[Dict]:
         """Load OAuth credentials from JSON file"""
@@ -73,23 +246,73 @@ class GmailHybridAnalyzer:
             return None
     
     def _load_token(self) -> Optional[str]:
-        """Load existing access token"""
+        """Load existing access token, plus refresh token and expiry when
+        the file holds the JSON form (older files hold just the token)"""
         if self.token_path.exists():
             try:
-                return self.token_path.read_text().strip()
+                content = self.token_path.read_text().strip()
             except Exception as e:
                 print(f"⚠️ Error loading token: {e}")
                 return None
+            
+            if not content.startswith('{'):
+                return content
+            try:
+                data = json.loads(content)
+            except ValueError as e:
+                print(f"⚠️ Error loading token: {e}")
+                return None
+            self.refresh_token = data.get('refresh_token')
+            self.expires_at = data.get('expires_at')
+            return data.get('access_token')
         return None
     
-    def save_token(self, token: str):
-        """Save access token from OAuth Playground"""
+    def _write_token(self):
+        """Persist access token, refresh token and expiry together"""
         self.token_path.parent.mkdir(parents=True, exist_ok=True)
-        self.token_path.write_text(token)
+        self.token_path.write_text(json.dumps({
+            'access_token': self.access_token,
+            'refresh_token': self.refresh_token,
+            'expires_at': self.expires_at
+        }))
+    
+    def save_token(self, token: str, refresh_token: str = None,
+                   expires_in: int = PLAYGROUND_TOKEN_LIFETIME):
+        """Save access token (and optional refresh token) from OAuth Playground"""
         self.access_token = token
+        self.refresh_token = refresh_token or self.refresh_token
+        self.expires_at = int(time.time()) + int(expires_in)
+        self._write_token()
         print(f"✅ Token saved to: {self.token_path}")
         return self.test_connection()
     
+    def _token_is_fresh(self) -> bool:
+        """True while the stored expiry says the token is still good"""
+        return bool(self.expires_at) and time.time() < self.expires_at - TOKEN_EXPIRY_MARGIN
+    
+    def refresh_access_token(self) -> bool:
+        """Trade the refresh token for a new access token"""
+        if not self.refresh_token or not self.credentials:
+            return False
+        
+        try:
+            response = requests.post(GOOGLE_TOKEN_URL, data={
+                'client_id': self.credentials.get('client_id'),
+                'client_secret': self.credentials.get('client_secret'),
+                'refresh_token': self.refresh_token,
+                'grant_type': 'refresh_token'
+            })
+            response.raise_for_status()
+            grant = json_loads(response.content)
+        except Exception as e:
+            print(f"⚠️ Token refresh failed: {e}")
+            return False
+        
+        self.access_token = grant['access_token']
+        self.expires_at = int(time.time()) + int(grant.get('expires_in', PLAYGROUND_TOKEN_LIFETIME))
+        self._write_token()
+        return True
+    
     def get_playground_instructions(self) -> str:
         """Get instructions for OAuth Playground setup"""
         if not self.credentials:
@@ -137,7 +360,8 @@ This bypasses the Google verification requirement!
         
         token = input("\nPaste your OAuth Playground access token: ").strip()
         if token:
-            return self.save_token(token)
+            refresh_token = input("Paste the refresh token too (Enter to skip): ").strip()
+            return self.save_token(token, refresh_token or None)
         else:
             print("No token provided")
             return False
@@ -149,14 +373,17 @@ This bypasses the Google verification requirement!
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get(
-                "https://gmail.googleapis.com/gmail/v1/users/me/profile",
-                headers=headers
-            )
-            response.raise_for_status()
+            if self.expires_at and not self._token_is_fresh():
+                self.refresh_access_token()
+            
+            profile = self._load_validation()
+            if profile is None:
+                response = self.session.get("https://gmail.googleapis.com/gmail/v1/users/me/profile")
+                response.raise_for_status()
+                
+                profile = json_loads(response.content)
+                self._save_validation(profile)
             
-            profile = response.json()
             print(f"✅ Gmail connection successful!")
             print(f"   Email: {profile.get('emailAddress')}")
             print(f"   Messages: {profile.get('messagesTotal'):,}")
@@ -170,151 +397,265 @@ This bypasses the Google verification requirement!
                 print("   Access denied. Check token permissions")
             return False
     
+    def _token_fingerprint(self) -> str:
+        """Short hash identifying the current token without storing it again"""
+        return hashlib.blake2b(self.access_token.encode(), digest_size=8).hexdigest()
+    
+    def _load_validation(self) -> Optional[Dict]:
+        """Profile from a test_connection within VALIDATION_TTL for this token"""
+        try:
+            cached = json.loads(self.validation_path.read_text())
+        except (OSError, ValueError):
+            return None
+        
+        if cached.get('token') != self._token_fingerprint():
+            return None
+        # A token with a known, future expiry needs no re-probe at all
+        if not self._token_is_fresh() and time.time() - cached.get('validated_at', 0) > VALIDATION_TTL:
+            return None
+        return cached.get('profile')
+    
+    def _save_validation(self, profile: Dict):
+        """Remember a successful test_connection for other calls and processes"""
+        try:
+            self.validation_path.parent.mkdir(parents=True, exist_ok=True)
+            self.validation_path.write_text(json.dumps({
+                'token': self._token_fingerprint(),
+                'validated_at': time.time(),
+                'profile': {key: profile.get(key) for key in ('emailAddress', 'messagesTotal')}
+            }))
+        except OSError:
+            pass  # Cache only; the next test_connection just probes again
+    
+    def _handle_401(self, response: requests.Response, *args, **kwargs):
+        """Session hook: a 401 from any Gmail call invalidates the validation
+        cache and, when a refresh token is stored, is retried once with a
+        freshly refreshed access token. kwargs are the original send's
+        options (timeout, verify, proxies, ...) and are kept for the retry."""
+        if response.status_code != 401:
+            return response
+        
+        sent = response.request.headers.get('Authorization')
+        with self._refresh_lock:
+            # Skip the refresh if another thread already replaced the token we sent
+            if sent in (None, f"Bearer {self.access_token}"):
+                self.validation_path.unlink(missing_ok=True)
+                if not self.refresh_access_token():
+                    return response
+        
+        retry = response.request.copy()
+        retry.headers['Authorization'] = f"Bearer {self.access_token}"
+        retry.hooks = {'response': []}  # a second 401 is final
+        return self.session.send(retry, **kwargs)
+    
     def analyze_job_applications(self, days_back: int = 30) -> Dict:
         """Analyze job application emails"""
         if not self.access_token:
             return self._mock_analysis("No access token configured")
         
         try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            
-            # Calculate date filter
-            after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-            
-            # Search for job-related emails
-            query = f'after:{after_date} (subject:(application OR interview OR position OR role OR hiring OR opportunity) OR from:(recruiting OR hr OR talent OR careers OR noreply))'
+            # Search for job-related emails. Promotions and social tabs (job
+            # alerts, newsletters) are filtered out server-side, and only
+            # the message ids come back
+            query = (
+                f'newer_than:{days_back}d -category:promotions -category:social '
+                '(subject:(application OR interview OR position OR role OR hiring OR opportunity) '
+                'OR from:(recruiting OR hr OR talent OR careers OR noreply))'
+            )
             
-            response = requests.get(
-                "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-                headers=headers,
-                params={'q': query, 'maxResults': 50}
+            response = self.session.get(
+                GMAIL_MESSAGES_URL,
+                params={'q': query, 'maxResults': 50, 'fields': 'messages(id)'}
             )
             response.raise_for_status()
             
-            messages = response.json().get('messages', [])
+            messages = json_loads(response.content).get('messages', [])
             
             analysis = {
                 'total_messages': len(messages),
-                'companies': set(),
+                'companies': [],
                 'message_types': {'applications': 0, 'interviews': 0, 'rejections': 0, 'replies': 0, 'other': 0},
-                'messages': [],
+                # Parallel per-message columns, appended in lockstep
+                'messages': {field: [] for field in MESSAGE_COLUMNS},
                 'time_period': f'last {days_back} days'
             }
+            columns = analysis['messages']
             
-            for msg in messages[:20]:  # Analyze first 20 messages
-                # Get message details
-                msg_response = requests.get(
-                    f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{msg['id']}",
-                    headers=headers
-                )
-                msg_response.raise_for_status()
-                msg_data = msg_response.json()
-                
+            # Analyze first 20 messages, fetched in one batch request
+            message_ids = [msg['id'] for msg in messages[:20]]
+            for msg_data in self.batch_get_messages(message_ids, params={'fields': MESSAGE_FIELDS}):
                 # Extract headers
-                headers_data = {h['name']: h['value'] for h in msg_data['payload'].get('headers', [])}
-                subject = headers_data.get('Subject', '')
-                sender = headers_data.get('From', '')
-                date = headers_data.get('Date', '')
+                headers_data = self._extract_headers(msg_data)
+                subject = headers_data.get('subject', '')
+                sender = headers_data.get('from', '')
+                date = headers_data.get('date', '')
                 
-                # Get message body for better categorization
-                body = self._get_message_body(msg_data)
-                
-                # Categorize message
-                msg_type = self._categorize_message(subject, sender, body)
+                # Categorize message; the body is only decoded when needed
+                msg_type = self._categorize_message(subject, sender, lambda: self._get_message_body(msg_data))
                 analysis['message_types'][msg_type] += 1
                 
                 # Extract company name
                 company = self._extract_company(sender, subject)
-                if company:
-                    analysis['companies'].add(company)
                 
-                analysis['messages'].append({
-                    'id': msg['id'],
-                    'subject': subject,
-                    'sender': sender,
-                    'date': date,
-                    'type': msg_type,
-                    'company': company
-                })
+                for field, value in zip(MESSAGE_COLUMNS, (msg_data['id'], subject, sender, date, msg_type, company)):
+                    columns[field].append(value)
             
-            analysis['companies'] = list(analysis['companies'])
+            # Distinct companies in one pass after the loop, first-seen order
+            analysis['companies'] = list(dict.fromkeys(filter(None, columns['company'])))
             return analysis
             
         except Exception as e:
             print(f"❌ Error analyzing job emails: {e}")
             return self._mock_analysis(f"Error: {e}")
     
+    def search_message_ids(self, queries: List[str], max_results: int = 10) -> Dict[str, Future]:
+        """Run independent Gmail searches concurrently on the shared session.
+        
+        Returns {query: future}, in query order; each future resolves to the
+        ids of that query's first max_results messages, or raises its
+        request error.
+        """
+        def search(query: str) -> List[str]:
+            response = self.session.get(
+                GMAIL_MESSAGES_URL,
+                params={'q': query, 'maxResults': max_results, 'fields': 'messages(id)'}
+            )
+            response.raise_for_status()
+            return [msg['id'] for msg in json_loads(response.content).get('messages', [])]
+        
+        with ThreadPoolExecutor(max_workers=min(GMAIL_FETCH_WORKERS, len(queries) or 1)) as pool:
+            return {query: pool.submit(search, query) for query in queries}
+    
+    def batch_get_messages(self, message_ids: List[str], params: Dict = None) -> List[Dict]:
+        """Fetch messages through Gmail's batch endpoint.
+        
+        One HTTP round-trip per GMAIL_BATCH_SIZE ids instead of one per
+        message. Returns message resources in the order of message_ids;
+        ids whose sub-request failed are left out.
+        """
+        query = f"?{urlencode(params, doseq=True)}" if params else ""
+        fetched = {}
+        
+        for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            chunk = message_ids[start:start + GMAIL_BATCH_SIZE]
+            boundary = f"batch_{uuid.uuid4().hex}"
+            body = "".join(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <{msg_id}>\r\n\r\n"
+                f"GET /gmail/v1/users/me/messages/{msg_id}{query}\r\n\r\n"
+                for msg_id in chunk
+            ) + f"--{boundary}--\r\n"
+            
+            response = self.session.post(
+                GMAIL_BATCH_URL,
+                headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+                data=body.encode()
+            )
+            if response.status_code in (401, 403):
+                response.raise_for_status()  # single GETs would fail the same way
+            if response.ok:
+                fetched.update(self._parse_batch_response(response))
+            else:
+                fetched.update(self._fetch_messages_concurrently(chunk, params))
+        
+        return [fetched[msg_id] for msg_id in message_ids if msg_id in fetched]
+    
+    def _fetch_messages_concurrently(self, message_ids: List[str], params: Dict = None) -> Dict[str, Dict]:
+        """Batch fallback: one messages.get per id, run concurrently so the
+        chunk costs about one round-trip instead of one per message"""
+        def fetch(msg_id: str) -> Optional[Dict]:
+            response = self.session.get(f"{GMAIL_MESSAGES_URL}/{msg_id}", params=params)
+            return json_loads(response.content) if response.ok else None
+        
+        with ThreadPoolExecutor(max_workers=min(GMAIL_FETCH_WORKERS, len(message_ids))) as pool:
+            return {data['id']: data for data in pool.map(fetch, message_ids) if data}
+    
+    @staticmethod
+    def _parse_batch_response(response: requests.Response) -> Dict[str, Dict]:
+        """Split a multipart/mixed batch response into {message id: resource}"""
+        envelope = BytesParser().parsebytes(
+            f"Content-Type: {response.headers['Content-Type']}\r\n\r\n".encode()
+            + response.content
+        )
+        
+        results = {}
+        for part in envelope.get_payload():
+            # Each part wraps a raw HTTP response: status line, headers, JSON
+            http_response = part.get_payload(decode=True) or b''
+            head, _, payload = http_response.partition(b'\r\n\r\n')
+            status_line = head.split(b'\r\n', 1)[0].split()
+            if len(status_line) < 2 or status_line[1] != b'200':
+                continue
+            
+            data = json_loads(payload)
+            results[data['id']] = data
+        return results
+    
+    def _extract_headers(self, msg_data: Dict, wanted=('subject', 'from', 'date')) -> Dict[str, str]:
+        """Pick the wanted headers out of a message in one pass.
+        
+        Header names are matched case-insensitively and returned lowercased,
+        so a 'subject' or 'FROM' header is found as well as 'Subject'/'From'.
+        """
+        headers = {}
+        for header in msg_data['payload'].get('headers', ()):
+            name = header['name'].lower()
+            if name in wanted and name not in headers:
+                headers[name] = header['value']
+                if len(headers) == len(wanted):
+                    break
+        return headers
+    
     def _get_message_body(self, msg_data: Dict) -> str:
-        """Extract body text from Gmail message"""
+        """Extract body text from Gmail message.
+        
+        text/plain parts are collected depth-first in document order, so
+        plain text nested inside multipart/alternative or multipart/mixed
+        is found too; decoding stops once BODY_LIMIT chars are collected.
+        """
         try:
             payload = msg_data['payload']
-            body = ''
             
-            if 'parts' in payload:
-                for part in payload['parts']:
-                    if part['mimeType'] == 'text/plain':
-                        if 'data' in part['body']:
-                            body += base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-            elif payload['body'].get('data'):
-                body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
+            if 'parts' not in payload:
+                data = payload.get('body', {}).get('data')
+                return _decode_body(data)[:BODY_LIMIT] if data else ''
+            
+            chunks, size = [], 0
+            stack = payload['parts'][::-1]
+            while stack and size < BODY_LIMIT:
+                part = stack.pop()
+                if 'parts' in part:
+                    stack.extend(reversed(part['parts']))
+                elif part.get('mimeType') == 'text/plain':
+                    # A fields mask can leave a part without body or data
+                    data = part.get('body', {}).get('data')
+                    if data:
+                        text = _decode_body(data)
+                        chunks.append(text)
+                        size += len(text)
             
-            return body[:1000]  # Limit to first 1000 chars
+            return ''.join(chunks)[:BODY_LIMIT]
         except:
             return ''
     
-    def _categorize_message(self, subject: str, sender: str, body: str) -> str:
-        """Categorize email message type"""
-        text = (subject + ' ' + sender + ' ' + body).lower()
+    def _categorize_message(self, subject: str, sender: str, get_body: Callable[[], str]) -> str:
+        """Categorize email message type.
         
-        # Interview patterns
-        if any(word in text for word in ['interview', 'call', 'meeting', 'schedule', 'calendar', 'zoom', 'phone screen']):
-            return 'interviews'
-        
-        # Rejection patterns
-        elif any(phrase in text for phrase in ['unfortunately', 'not moving forward', 'other candidate', 'declined', 'regret']):
-            return 'rejections'
-        
-        # Reply patterns (automated acknowledgments)
-        elif any(phrase in text for phrase in ['thank you for your', 'received your application', 'reviewing your', 'noreply', 'no-reply']):
-            return 'replies'
-        
-        # Application patterns
-        elif any(word in text for word in ['application', 'apply', 'position', 'role', 'opportunity', 'opening']):
-            return 'applications'
-        
-        else:
-            return 'other'
+        get_body is only called when subject and sender alone leave a
+        higher-priority category possible, so a message already marked as
+        an interview never has its body decoded.
+        """
+        # One scan finds every category's keywords at once
+        hits = keyword_hits(_CATEGORY_SCANNER, (subject + ' ' + sender).lower())
+        if _CATEGORIES[0] not in hits:
+            hits |= keyword_hits(_CATEGORY_SCANNER, get_body().lower())
+        return next((category for category in _CATEGORIES if category in hits), 'other')
     
     def _extract_company(self, sender: str, subject: str) -> Optional[str]:
         """Extract company name from sender or subject"""
-        # Extract from sender email domain
-        email_match = re.search(r'@([^.]+)\.', sender)
-        if email_match:
-            domain = email_match.group(1)
-            # Skip common email providers
-            if domain not in ['gmail', 'yahoo', 'outlook', 'hotmail', 'icloud', 'noreply', 'mail']:
-                # Clean up common prefixes
-                domain = domain.replace('careers', '').replace('jobs', '').replace('mail', '')
-                if len(domain) > 2:
-                    return domain.title()
-        
-        # Extract from sender name
-        name_match = re.search(r'^([^<@]+)', sender)
-        if name_match:
-            name = name_match.group(1).strip()
-            # Skip generic recruiting terms
-            if not any(word in name.lower() for word in ['recruiting', 'talent', 'hr', 'careers', 'jobs', 'team']):
-                # Extract company name from formats like "John at CompanyName"
-                at_match = re.search(r'\bat\s+([A-Z][a-zA-Z]+)', name)
-                if at_match:
-                    return at_match.group(1)
-                
-                # Use first part if it looks like a company
-                words = name.split()
-                if words and len(words[0]) > 3 and words[0][0].isupper():
-                    return words[0]
-        
-        return None
+        # Only the sender is used, and recruiting mail repeats the same senders
+        return _company_from_sender(sender)
     
     def _mock_analysis(self, message: str) -> Dict:
         """Return mock data when Gmail is not available"""
@@ -322,7 +663,7 @@ This bypasses the Google verification requirement!
             'total_messages': 0,
             'companies': [],
             'message_types': {'applications': 0, 'interviews': 0, 'rejections': 0, 'replies': 0, 'other': 0},
-            'messages': [],
+            'messages': {field: [] for field in MESSAGE_COLUMNS},
             'time_period': 'last 30 days',
             'error': message
         }
@@ -375,34 +716,29 @@ To set up Gmail:
             return False
         
         try:
-            import email
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = from_name
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Add body
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Convert to raw format
-            raw_message = base64.urlsafe_b64encode(msg.as_bytes()).decode('utf-8')
+            # A single text/plain message written out directly; no MIME tree
+            raw = (
+                f"From: {_header_value(from_name)}\r\n"
+                f"To: {_header_value(to_email)}\r\n"
+                f"Subject: {_header_value(subject)}\r\n"
+                "MIME-Version: 1.0\r\n"
+                "Content-Type: text/plain; charset=utf-8\r\n"
+                "Content-Transfer-Encoding: 8bit\r\n"
+                "\r\n"
+                f"{body}"
+            ).encode('utf-8')
+            raw_message = base64.urlsafe_b64encode(raw).decode('ascii')
             
             # Send via Gmail API
-            headers = {"Authorization": f"Bearer {self.access_token}"}
             data = {"raw": raw_message}
             
-            response = requests.post(
-                "https://gmail.googleapis.com/gmail/v1/users/me/messages/send",
-                headers=headers,
+            response = self.session.post(
+                f"{GMAIL_MESSAGES_URL}/send",
                 json=data
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = json_loads(response.content)
             print(f"✅ Email sent successfully!")
             print(f"   To: {to_email}")
             print(f"   Subject: {subject}")
@@ -6,9 +6,14 @@ Provides actual Gmail API functionality for job application tracking
 
 import os
 import json
+import atexit
+import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
 import re
 
 # Gmail API imports
@@ -22,6 +27,87 @@ except ImportError:
     GMAIL_AVAILABLE = False
     print("⚠️ Gmail API libraries not installed. Run: pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client")
 
+try:
+    import re2 as regex  # google-re2: linear-time matching, no backtracking
+except ImportError:
+    regex = re
+
+# Gmail's batch endpoint accepts 100 calls per request, but starts
+# rate-limiting sub-requests above about 50 (same as gmail_hybrid)
+GMAIL_BATCH_LIMIT = 50
+# Pause before the one retry of sub-requests that failed, usually rate limits
+BATCH_RETRY_DELAY = 1.0
+# messages.list page size (the API maximum); results are bounded by the query's date range
+GMAIL_LIST_PAGE_SIZE = 500
+BODY_LIMIT = 2000  # chars of body text kept for categorization
+# Seconds of validity below which a token is refreshed at process exit
+TOKEN_REFRESH_AHEAD = 600
+# Partial response for categorization: headers plus the body data that
+# _get_message_body reads, dropping labels, part headers and attachment info
+FULL_MESSAGE_FIELDS = 'id,payload(headers(name,value),body/data,parts(mimeType,body/data))'
+
+
+def _union(patterns):
+    """Compile patterns into one alternation so a single scan tests them all"""
+    return regex.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+# Job email categories, matched against lowercased subject and body. Words
+# are fenced with \b and gaps bounded to 80 chars so a long body that
+# never completes a phrase cannot backtrack across its whole length.
+INTERVIEW_RE = _union([
+    r'\bschedule.{0,80}?\binterview', r'\binterview.{0,80}?\bscheduled', r'\binterview.{0,80}?\btime',
+    r'\bphone screen', r'\btechnical interview', r'\bonsite', r'\bzoom call'
+])
+REJECTION_RE = _union([
+    r'\bunfortunately', r'\bnot\b.{0,80}?\bmoving forward', r'\bother candidate',
+    r'\bdecided not to\b', r'\bnot\b.{0,80}?\bselected\b', r'\bregret to inform'
+])
+REPLY_RE = _union([
+    r'\bthank you for.{0,80}?\bapplication', r'\breceived your.{0,80}?\bapplication',
+    r'\breviewing your.{0,80}?\bapplication', r'\bnext steps\b', r'\bwe.{0,80}?ll be in touch'
+])
+
+# Date mentions in an interview email: numeric date, weekday + day, month + day
+DATE_MENTION_RE = regex.compile(
+    r'\d{1,2}/\d{1,2}/\d{2,4}'
+    r'|(?:monday|tuesday|wednesday|thursday|friday)\s+\d{1,2}'
+    r'|(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}',
+    regex.IGNORECASE
+)
+
+# Every pattern in a category contains one of its keywords, so a message
+# with none of them can skip that category's regex
+INTERVIEW_KEYWORDS = ('interview', 'screen', 'onsite', 'zoom')
+REJECTION_KEYWORDS = ('unfortunately', 'not', 'other candidate', 'regret')
+REPLY_KEYWORDS = ('application', 'next steps', 'll be in touch')
+
+
+def _category_hit(keywords, pattern, subject: str, body: str) -> bool:
+    """Substring prefilter, then the category regex; the short subject is
+    checked before the body so a subject hit skips the body scan"""
+    if not any(k in subject or k in body for k in keywords):
+        return False
+    return bool(pattern.search(subject) or pattern.search(body))
+
+
+_SENDER_DOMAIN_RE = re.compile(r'@([a-zA-Z0-9-]+)\.(com|io|co|org)')
+_DOMAIN_NOISE_RE = re.compile(r'mail|careers|jobs')
+_AT_COMPANY_RE = re.compile(r'\bat ([A-Z][a-zA-Z]+)')
+
+
+@lru_cache(maxsize=1024)
+def _company_from_domain(from_email: str) -> Optional[str]:
+    """Company name from the sender's domain; cached because the same
+    recruiter address recurs across a run"""
+    domain_match = _SENDER_DOMAIN_RE.search(from_email)
+    if domain_match:
+        # Clean up common email prefixes
+        company = _DOMAIN_NOISE_RE.sub('', domain_match.group(1))
+        if len(company) > 2:
+            return company.title()
+    return None
+
 class GmailAnalyzer:
     """Gmail analyzer for brain system integration"""
     
@@ -36,6 +122,8 @@ class GmailAnalyzer:
         
         self.token_path = self.credentials_path.parent / "gmail_token.json"
         self.service = None
+        self.creds = None
+        self._refresh_ahead_registered = False
         
         if GMAIL_AVAILABLE and self.credentials_path.exists():
             self.authenticate()
@@ -80,12 +168,38 @@ class GmailAnalyzer:
                 creds = flow.run_local_server(port=0)
             
             # Save the credentials for the next run
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
+            self._save_credentials(creds)
+        
+        # Short CLI runs often end close to expiry; refresh on the way out
+        # so the next run starts with a fresh token. Registered once: the
+        # hook reads self.creds, so re-authenticating only swaps that.
+        self.creds = creds
+        if not self._refresh_ahead_registered:
+            atexit.register(self._refresh_ahead)
+            self._refresh_ahead_registered = True
         
         self.service = build('gmail', 'v1', credentials=creds)
         return True
     
+    def _save_credentials(self, creds):
+        """Write access/refresh token and expiry to gmail_token.json"""
+        with open(self.token_path, 'w') as token:
+            token.write(creds.to_json())
+    
+    def _refresh_ahead(self):
+        """Refresh and save self.creds if they expire within TOKEN_REFRESH_AHEAD"""
+        creds = self.creds
+        if not (creds and creds.refresh_token and creds.expiry):
+            return
+        # google-auth keeps expiry as naive UTC
+        if creds.expiry - datetime.now(timezone.utc).replace(tzinfo=None) > timedelta(seconds=TOKEN_REFRESH_AHEAD):
+            return
+        try:
+            creds.refresh(Request())
+            self._save_credentials(creds)
+        except Exception:
+            pass  # the next run refreshes at startup as before
+    
     def analyze_job_applications(self, days_back: int = 30) -> Dict:
         """Analyze job application emails"""
         if not self.service:
@@ -98,18 +212,9 @@ class GmailAnalyzer:
             # Search query for job-related emails
             query = f'after:{after_date} (subject:(application OR interview OR position OR role OR hiring OR opportunity OR opening) OR from:(recruiting OR hr OR talent OR careers OR jobs))'
             
-            # Get messages
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=100
-            ).execute()
-            
-            messages = results.get('messages', [])
-            
             # Analyze messages
             analysis = {
-                'total_job_emails': len(messages),
+                'total_job_emails': 0,
                 'replies_received': 0,
                 'interviews_scheduled': 0,
                 'rejections': 0,
@@ -119,56 +224,36 @@ class GmailAnalyzer:
                 'next_interviews': []
             }
             
-            # Patterns for categorization
-            interview_patterns = [
-                r'schedule.*interview', r'interview.*scheduled', r'interview.*time',
-                r'phone screen', r'technical interview', r'onsite', r'zoom call'
-            ]
-            rejection_patterns = [
-                r'unfortunately', r'not.*moving forward', r'other candidate',
-                r'decided not to', r'not.*selected', r'regret to inform'
-            ]
-            reply_patterns = [
-                r'thank you for.*application', r'received your.*application',
-                r'reviewing your.*application', r'next steps', r'we.*ll be in touch'
-            ]
-            
-            for msg_id in messages:
-                msg = self.service.users().messages().get(
-                    userId='me',
-                    id=msg_id['id'],
-                    format='full'
-                ).execute()
-                
-                # Extract email content
-                headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
-                subject = headers.get('Subject', '').lower()
-                from_email = headers.get('From', '').lower()
-                body = self._get_message_body(msg).lower()
-                
-                # Extract company name
-                company = self._extract_company_name(from_email, subject)
-                if company:
-                    analysis['companies'].add(company)
-                
-                # Categorize email
-                if any(re.search(pattern, body) or re.search(pattern, subject) 
-                       for pattern in interview_patterns):
-                    analysis['interviews_scheduled'] += 1
-                    # Try to extract interview date/time
-                    interview_info = self._extract_interview_info(body, subject, headers)
-                    if interview_info:
-                        analysis['next_interviews'].append(interview_info)
-                        
-                elif any(re.search(pattern, body) or re.search(pattern, subject) 
-                         for pattern in rejection_patterns):
-                    analysis['rejections'] += 1
+            for listed, messages in self._iter_message_batches(query, format='full', fields=FULL_MESSAGE_FIELDS):
+                # Totals count listed messages, including any that failed to fetch
+                analysis['total_job_emails'] += listed
+                for msg in messages:
+                    # Extract email content
+                    headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
+                    subject = headers.get('Subject', '').lower()
+                    from_email = headers.get('From', '').lower()
+                    body = self._get_message_body(msg).lower()
+                    
+                    # Extract company name
+                    company = self._extract_company_name(from_email, subject)
+                    if company:
+                        analysis['companies'].add(company)
+                    
+                    # Categorize email
+                    if _category_hit(INTERVIEW_KEYWORDS, INTERVIEW_RE, subject, body):
+                        analysis['interviews_scheduled'] += 1
+                        # Try to extract interview date/time
+                        interview_info = self._extract_interview_info(body, subject, headers)
+                        if interview_info:
+                            analysis['next_interviews'].append(interview_info)
+                    
+                    elif _category_hit(REJECTION_KEYWORDS, REJECTION_RE, subject, body):
+                        analysis['rejections'] += 1
                     
-                elif any(re.search(pattern, body) or re.search(pattern, subject) 
-                         for pattern in reply_patterns):
-                    analysis['replies_received'] += 1
-                else:
-                    analysis['pending_responses'] += 1
+                    elif _category_hit(REPLY_KEYWORDS, REPLY_RE, subject, body):
+                        analysis['replies_received'] += 1
+                    else:
+                        analysis['pending_responses'] += 1
             
             # Convert set to list for JSON serialization
             analysis['companies'] = list(analysis['companies'])
@@ -189,28 +274,17 @@ class GmailAnalyzer:
             
             query = f'after:{after_date} (from:(founder OR ceo OR cofounder OR startup) OR subject:(partnership OR collaboration OR startup OR venture))'
             
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=50
-            ).execute()
-            
-            messages = results.get('messages', [])
+            message_ids = [m['id'] for page in self._iter_message_pages(query) for m in page]
             
             founder_data = {
-                'total_founder_emails': len(messages),
+                'total_founder_emails': len(message_ids),
                 'founders': [],
                 'time_period': f'last {days_back} days'
             }
             
-            for msg_id in messages[:10]:  # Analyze top 10
-                msg = self.service.users().messages().get(
-                    userId='me',
-                    id=msg_id['id'],
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date']
-                ).execute()
-                
+            # Analyze top 10
+            for msg in self._batch_get_messages(message_ids[:10], format='metadata',
+                                                metadataHeaders=['From', 'Subject', 'Date']):
                 headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
                 founder_data['founders'].append({
                     'from': headers.get('From', 'Unknown'),
@@ -224,65 +298,131 @@ class GmailAnalyzer:
             print(f"❌ Error searching founder emails: {e}")
             return {'total_founder_emails': 0, 'founders': [], 'time_period': f'last {days_back} days'}
     
+    def _iter_message_pages(self, query: str) -> Iterator[List[Dict]]:
+        """Yield every page of messages.list results for query, following
+        nextPageToken until the last page"""
+        request = self.service.users().messages().list(
+            userId='me', q=query, maxResults=GMAIL_LIST_PAGE_SIZE,
+            fields='messages(id),nextPageToken'
+        )
+        while request is not None:
+            results = request.execute()
+            yield results.get('messages', [])
+            request = self.service.users().messages().list_next(request, results)
+    
+    def _iter_message_batches(self, query: str, **params) -> Iterator[Tuple[int, List[Dict]]]:
+        """Yield (listed count, fetched message resources) for each page of
+        query results, one batch request per page.
+        
+        The next page is listed and fetched in the background while the
+        caller works through the current one. A single worker keeps every
+        API call on one thread, since the httplib2 transport is not
+        thread-safe.
+        """
+        pages = self._iter_message_pages(query)
+        
+        def fetch_next_page() -> Optional[Tuple[int, List[Dict]]]:
+            page = next(pages, None)
+            if page is None:
+                return None
+            return len(page), self._batch_get_messages([m['id'] for m in page], **params)
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(fetch_next_page)
+            while True:
+                batch = pending.result()
+                if batch is None:
+                    return
+                pending = pool.submit(fetch_next_page)
+                yield batch
+    
+    def _batch_get_messages(self, message_ids: List[str], **params) -> List[Dict]:
+        """Fetch messages with one batch HTTP request per GMAIL_BATCH_LIMIT ids.
+        
+        Sub-requests that fail are retried once after BATCH_RETRY_DELAY;
+        ids that fail again are reported and left out. Returns message
+        resources in the order of message_ids.
+        """
+        fetched, failed = {}, {}
+        
+        def on_message(request_id, response, exception):
+            if exception is None:
+                fetched[request_id] = response
+            else:
+                failed[request_id] = exception
+        
+        def execute(ids: List[str]):
+            for start in range(0, len(ids), GMAIL_BATCH_LIMIT):
+                batch = self.service.new_batch_http_request(callback=on_message)
+                for msg_id in ids[start:start + GMAIL_BATCH_LIMIT]:
+                    batch.add(
+                        self.service.users().messages().get(userId='me', id=msg_id, **params),
+                        request_id=msg_id
+                    )
+                batch.execute()
+        
+        execute(message_ids)
+        if failed:
+            retry_ids = list(failed)
+            failed.clear()
+            time.sleep(BATCH_RETRY_DELAY)
+            execute(retry_ids)
+        if failed:
+            print(f"⚠️ {len(failed)} of {len(message_ids)} messages could not be fetched: "
+                  f"{next(iter(failed.values()))}")
+        
+        return [fetched[msg_id] for msg_id in message_ids if msg_id in fetched]
+    
     def _get_message_body(self, msg) -> str:
-        """Extract body from Gmail message"""
+        """Extract body from Gmail message.
+        
+        text/plain parts are joined as bytes and decoded once; only the
+        bytes that can fall inside the first BODY_LIMIT chars are decoded.
+        """
         try:
             payload = msg['payload']
-            body = ''
             
+            # FULL_MESSAGE_FIELDS leaves out 'body' where a part has no data
             if 'parts' in payload:
-                for part in payload['parts']:
-                    if part['mimeType'] == 'text/plain':
-                        data = part['body']['data']
-                        body += self._decode_base64(data)
-            elif payload['body'].get('data'):
-                body = self._decode_base64(payload['body']['data'])
-                
-            return body[:2000]  # Limit to first 2000 chars
+                raw = b''.join(
+                    base64.urlsafe_b64decode(part['body']['data'])
+                    for part in payload['parts']
+                    if part.get('mimeType') == 'text/plain' and part.get('body', {}).get('data')
+                )
+            elif payload.get('body', {}).get('data'):
+                raw = base64.urlsafe_b64decode(payload['body']['data'])
+            else:
+                return ''
+            
+            # A UTF-8 char is at most 4 bytes
+            return raw[:BODY_LIMIT * 4].decode('utf-8', errors='ignore')[:BODY_LIMIT]
         except:
             return ''
     
-    def _decode_base64(self, data) -> str:
-        """Decode base64 email data"""
-        import base64
-        return base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-    
     def _extract_company_name(self, from_email: str, subject: str) -> Optional[str]:
         """Extract company name from email"""
         # Try to extract from domain
-        domain_match = re.search(r'@([a-zA-Z0-9-]+)\.(com|io|co|org)', from_email)
-        if domain_match:
-            company = domain_match.group(1)
-            # Clean up common email prefixes
-            company = company.replace('mail', '').replace('careers', '').replace('jobs', '')
-            if len(company) > 2:
-                return company.title()
+        company = _company_from_domain(from_email)
+        if company:
+            return company
         
         # Try to extract from subject
-        if 'at ' in subject:
-            at_match = re.search(r'at ([A-Z][a-zA-Z]+)', subject)
-            if at_match:
-                return at_match.group(1)
+        at_match = _AT_COMPANY_RE.search(subject)
+        if at_match:
+            return at_match.group(1)
         
         return None
     
     def _extract_interview_info(self, body: str, subject: str, headers: Dict) -> Optional[Dict]:
         """Extract interview date and time if possible"""
-        # Look for date patterns
-        date_patterns = [
-            r'(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'(monday|tuesday|wednesday|thursday|friday)\s+\d{1,2}',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, body.lower())
-            if match:
-                return {
-                    'company': self._extract_company_name(headers.get('From', ''), subject),
-                    'date_mention': match.group(0),
-                    'subject': subject[:100]
-                }
+        # First date mention of any form
+        match = DATE_MENTION_RE.search(body)
+        if match:
+            return {
+                'company': self._extract_company_name(headers.get('From', ''), subject),
+                'date_mention': match.group(0).lower(),
+                'subject': subject[:100]
+            }
         
         return None
     
@@ -45,8 +45,8 @@ if [ -f "/Users/tarive/brain/config/tokens/gmail_token.txt" ]; then
     python3 -c "
 import sys
 sys.path.insert(0, '/Users/tarive/brain')
-from brain import brain
-brain.gmail.test_connection()
+from brain import BrainSystem
+BrainSystem().gmail.test_connection()
 "
 else
     echo "⚠️ No Gmail token found. Please set one up using the instructions above."
@@ -5,7 +5,6 @@ Specific TPU Credit Expiration Search
 
 import sys
 import os
-import requests
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -14,7 +13,27 @@ from pathlib import Path
 BRAIN_ROOT = Path(__file__).parent
 sys.path.insert(0, str(BRAIN_ROOT / "integrations"))
 
-from gmail.gmail_hybrid import GmailHybridAnalyzer
+from gmail.gmail_hybrid import MESSAGE_FIELDS, GmailHybridAnalyzer
+
+_MONTH = r'(january|february|march|april|may|june|july|august|september|october|november|december)'
+
+# Expiration date patterns, compiled once. Each is searched on its own:
+# as one alternation, a match would consume text another pattern needs
+EXPIRY_DATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'expir[es]*.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    r'valid until.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    r'deadline.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    r'end[s]? on.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    _MONTH + r'\s+\d{1,2},?\s+\d{4}.*expir',
+    r'expir.*?' + _MONTH + r'\s+\d{1,2},?\s+\d{4}'
+]]
+
+# Credit amount patterns ("$300 credit" is found by the first two)
+CREDIT_AMOUNT_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'\$([0-9,]+(?:\.[0-9]{2})?)',
+    r'([0-9,]+)\s*credit',
+    r'([0-9,]+)\s*dollar'
+]]
 
 def search_tpu_expiration():
     """Search specifically for TPU credit expiration information"""
@@ -24,8 +43,6 @@ def search_tpu_expiration():
         print("❌ No Gmail access token")
         return
     
-    headers = {"Authorization": f"Bearer {gmail.access_token}"}
-    
     # Very specific TPU credit expiration searches
     specific_queries = [
         'from:google-cloud-support TPU',
@@ -40,84 +57,61 @@ def search_tpu_expiration():
     
     print("🔍 Searching for TPU credit expiration...")
     
-    all_findings = []
+    # Queries overlap, so ids are collected first and each message is fetched once
+    message_ids = {}
     
-    for query in specific_queries:
+    for query, search in gmail.search_message_ids(specific_queries).items():
         print(f"   Searching: {query}")
         
         try:
-            response = requests.get(
-                "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-                headers=headers,
-                params={'q': query, 'maxResults': 10}
-            )
-            response.raise_for_status()
+            ids = search.result()
+            print(f"   Found {len(ids)} messages")
             
-            messages = response.json().get('messages', [])
-            print(f"   Found {len(messages)} messages")
+            message_ids.update(dict.fromkeys(ids))
             
-            for msg in messages:
-                # Get full message
-                msg_response = requests.get(
-                    f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{msg['id']}",
-                    headers=headers
-                )
-                msg_response.raise_for_status()
-                msg_data = msg_response.json()
-                
-                # Extract details
-                headers_data = {h['name']: h['value'] for h in msg_data['payload'].get('headers', [])}
-                subject = headers_data.get('Subject', '')
-                sender = headers_data.get('From', '')
-                date = headers_data.get('Date', '')
-                body = gmail._get_message_body(msg_data)
-                
-                # Look for expiration info
-                full_text = f"{subject} {body}".lower()
-                
-                # Date extraction patterns
-                date_patterns = [
-                    r'expir[es]*.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                    r'valid until.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                    r'deadline.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                    r'end[s]? on.*?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                    r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}.*expir',
-                    r'expir.*?(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}'
-                ]
-                
-                found_dates = []
-                for pattern in date_patterns:
-                    matches = re.findall(pattern, full_text, re.IGNORECASE)
-                    found_dates.extend(matches)
-                
-                # Credit amount patterns
-                credit_patterns = [
-                    r'\$([0-9,]+(?:\.[0-9]{2})?)',
-                    r'([0-9,]+)\s*credit',
-                    r'([0-9,]+)\s*dollar'
-                ]
-                
-                found_credits = []
-                for pattern in credit_patterns:
-                    matches = re.findall(pattern, full_text, re.IGNORECASE)
-                    found_credits.extend(matches)
-                
-                if found_dates or found_credits or 'tpu' in full_text or 'quota' in full_text:
-                    finding = {
-                        'id': msg['id'],
-                        'subject': subject,
-                        'sender': sender,
-                        'date': date,
-                        'found_dates': found_dates,
-                        'found_credits': found_credits,
-                        'body_snippet': body[:300] + "..." if len(body) > 300 else body
-                    }
-                    all_findings.append(finding)
-                    
         except Exception as e:
             print(f"   Error with query '{query}': {e}")
             continue
     
+    try:
+        fetched = gmail.batch_get_messages(list(message_ids), params={'fields': MESSAGE_FIELDS})
+    except Exception as e:
+        print(f"   Error fetching messages: {e}")
+        fetched = []
+    
+    all_findings = []
+    
+    for msg_data in fetched:
+        # Extract details
+        headers_data = gmail._extract_headers(msg_data)
+        subject = headers_data.get('subject', '')
+        sender = headers_data.get('from', '')
+        date = headers_data.get('date', '')
+        body = gmail._get_message_body(msg_data)
+        
+        # Look for expiration info
+        full_text = f"{subject} {body}".lower()
+        
+        found_dates = []
+        for pattern in EXPIRY_DATE_PATTERNS:
+            found_dates.extend(pattern.findall(full_text))
+        
+        found_credits = []
+        for pattern in CREDIT_AMOUNT_PATTERNS:
+            found_credits.extend(pattern.findall(full_text))
+        
+        if found_dates or found_credits or 'tpu' in full_text or 'quota' in full_text:
+            finding = {
+                'id': msg_data['id'],
+                'subject': subject,
+                'sender': sender,
+                'date': date,
+                'found_dates': found_dates,
+                'found_credits': found_credits,
+                'body_snippet': body[:300] + "..." if len(body) > 300 else body
+            }
+            all_findings.append(finding)
+    
     # Print findings
     print(f"\n📊 TPU Credit Search Results:")
     print("=" * 50)
@@ -130,19 +124,10 @@ def search_tpu_expiration():
         print("   • Search for 'billing' or 'quota' emails manually")
         return
     
-    # Remove duplicates and sort by relevance
-    unique_findings = []
-    seen_ids = set()
-    
-    for finding in all_findings:
-        if finding['id'] not in seen_ids:
-            unique_findings.append(finding)
-            seen_ids.add(finding['id'])
-    
-    print(f"Found {len(unique_findings)} unique relevant emails:")
+    print(f"Found {len(all_findings)} unique relevant emails:")
     print()
     
-    for i, finding in enumerate(unique_findings[:5], 1):
+    for i, finding in enumerate(all_findings[:5], 1):
         print(f"{i}. 📧 {finding['subject']}")
         print(f"   From: {finding['sender']}")
         print(f"   Date: {finding['date']}")
@@ -160,7 +145,7 @@ def search_tpu_expiration():
         
         print()
     
-    return unique_findings
+    return all_findings
 
 if __name__ == "__main__":
     findings = search_tpu_expiration()
\ No newline at end of file
@@ -5,8 +5,8 @@ Verify Interview Claims - Show Actual Email Details
 
 import sys
 import os
-import requests
 import json
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -14,7 +14,50 @@ from pathlib import Path
 BRAIN_ROOT = Path(__file__).parent
 sys.path.insert(0, str(BRAIN_ROOT / "integrations"))
 
-from gmail.gmail_hybrid import GmailHybridAnalyzer
+from gmail.gmail_hybrid import MESSAGE_FIELDS, GmailHybridAnalyzer
+
+try:
+    import re2 as regex  # same compile/search API as re, guaranteed linear time
+except ImportError:
+    regex = re
+
+# Spam/promotional indicators, found with one scan of the email text
+spam_indicators = [
+    'unsubscribe',
+    'marketing',
+    'newsletter',
+    'promotion',
+    'discount',
+    'free trial',
+    'limited time',
+    'click here',
+    'noreply',
+    'no-reply',
+    'automated',
+    'do not reply'
+]
+SPAM_RE = regex.compile('|'.join(map(re.escape, spam_indicators)))
+
+# Real interview indicators, unioned so one scan of the email tests them all
+# (same \b / .{0,80}? fencing as GmailAnalyzer's category patterns)
+real_interview_patterns = [
+    r'\bschedule.{0,80}?\binterview',
+    r'\binterview.{0,80}?\bschedule',
+    r'\bphone screen',
+    r'\btechnical interview',
+    r'\bonsite interview',
+    r'\bzoom\b.{0,80}?\binterview',
+    r'\bteams\b.{0,80}?\bmeeting',
+    r'\binterview.{0,80}?\btime',
+    r'\bavailable\b.{0,80}?\binterview',
+    r'\bhr\b.{0,80}?\binterview',
+    r'\bhiring manager',
+    r'\brecruiter.{0,80}?\bcall',
+    r'\binterview.{0,80}?\binvitation'
+]
+REAL_INTERVIEW_RE = regex.compile('|'.join(f'(?:{p})' for p in real_interview_patterns))
+# Each pattern above contains one of these words; most mail has none of them
+INTERVIEW_KEYWORDS = ('interview', 'screen', 'meeting', 'hiring', 'recruiter')
 
 def verify_interview_emails():
     """Get actual details of emails categorized as interviews"""
@@ -24,8 +67,6 @@ def verify_interview_emails():
         print("❌ No Gmail access token")
         return
     
-    headers = {"Authorization": f"Bearer {gmail.access_token}"}
-    
     # Search for interview-related emails in last 90 days
     interview_queries = [
         'interview',
@@ -39,57 +80,36 @@ def verify_interview_emails():
     print("🔍 Verifying Interview Email Claims...")
     print("=" * 60)
     
-    all_interview_emails = []
+    # Ids in first-seen order; queries overlap, so each is kept (and fetched) once
+    unique_ids = {}
     
-    for query in interview_queries:
-        after_date = (datetime.now() - timedelta(days=90)).strftime('%Y/%m/%d')
-        full_query = f'after:{after_date} {query}'
-        
+    after_date = (datetime.now() - timedelta(days=90)).strftime('%Y/%m/%d')
+    searches = gmail.search_message_ids([f'after:{after_date} {query}' for query in interview_queries])
+    
+    for query, search in zip(interview_queries, searches.values()):
         try:
-            response = requests.get(
-                "https://gmail.googleapis.com/gmail/v1/users/me/messages",
-                headers=headers,
-                params={'q': full_query, 'maxResults': 10}
-            )
-            response.raise_for_status()
-            
-            messages = response.json().get('messages', [])
-            all_interview_emails.extend(messages)
+            unique_ids.update(dict.fromkeys(search.result()))
             
         except Exception as e:
             print(f"Error with query '{query}': {e}")
             continue
     
-    # Remove duplicates
-    unique_emails = []
-    seen_ids = set()
-    for email in all_interview_emails:
-        if email['id'] not in seen_ids:
-            unique_emails.append(email)
-            seen_ids.add(email['id'])
-    
-    print(f"Found {len(unique_emails)} unique potential interview emails")
+    print(f"Found {len(unique_ids)} unique potential interview emails")
     print()
     
     verified_interviews = []
     spam_or_promotional = []
     unclear_emails = []
     
-    for i, email in enumerate(unique_emails[:15], 1):  # Check first 15
+    # Get full email details for the first 15 in one batch request
+    checked_ids = list(unique_ids)[:15]
+    for i, msg_data in enumerate(gmail.batch_get_messages(checked_ids, params={'fields': MESSAGE_FIELDS}), 1):
         try:
-            # Get full email details
-            msg_response = requests.get(
-                f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{email['id']}",
-                headers=headers
-            )
-            msg_response.raise_for_status()
-            msg_data = msg_response.json()
-            
             # Extract details
-            headers_data = {h['name']: h['value'] for h in msg_data['payload'].get('headers', [])}
-            subject = headers_data.get('Subject', '')
-            sender = headers_data.get('From', '')
-            date = headers_data.get('Date', '')
+            headers_data = gmail._extract_headers(msg_data)
+            subject = headers_data.get('subject', '')
+            sender = headers_data.get('from', '')
+            date = headers_data.get('date', '')
             body = gmail._get_message_body(msg_data)
             
             print(f"{i}. 📧 ANALYZING EMAIL:")
@@ -180,57 +200,24 @@ def analyze_email_legitimacy(subject: str, sender: str, body: str) -> dict:
     
     text = (subject + ' ' + sender + ' ' + body).lower()
     
-    # Spam/promotional indicators
-    spam_indicators = [
-        'unsubscribe',
-        'marketing',
-        'newsletter',
-        'promotion',
-        'discount',
-        'free trial',
-        'limited time',
-        'click here',
-        'noreply',
-        'no-reply',
-        'automated',
-        'do not reply'
-    ]
-    
     # Check for spam
-    for indicator in spam_indicators:
-        if indicator in text:
-            analysis['is_spam_or_promotional'] = True
-            analysis['spam_reason'] = f"Contains '{indicator}'"
-            return analysis
-    
-    # Real interview indicators
-    real_interview_patterns = [
-        'schedule.*interview',
-        'interview.*schedule',
-        'phone screen',
-        'technical interview',
-        'onsite interview',
-        'zoom.*interview',
-        'teams.*meeting',
-        'interview.*time',
-        'available.*interview',
-        'hr.*interview',
-        'hiring manager',
-        'recruiter.*call',
-        'interview.*invitation'
-    ]
+    spam_match = SPAM_RE.search(text)
+    if spam_match:
+        analysis['is_spam_or_promotional'] = True
+        analysis['spam_reason'] = f"Contains '{spam_match.group(0)}'"
+        return analysis
+    
+    # Cheap literal check before the full pattern sweep
+    if not any(k in text for k in INTERVIEW_KEYWORDS):
+        return analysis
     
     # Check for real interview patterns
-    import re
-    for pattern in real_interview_patterns:
-        if re.search(pattern, text):
-            analysis['is_real_interview'] = True
-            break
+    if REAL_INTERVIEW_RE.search(text):
+        analysis['is_real_interview'] = True
     
     # Extract company name
     if analysis['is_real_interview']:
         # Try to get company from email domain
-        import re
         email_match = re.search(r'@([^.]+)\.', sender)
         if email_match:
             domain = email_match.group(1)
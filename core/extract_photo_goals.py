@@ -166,12 +166,12 @@ class PhotoGoalExtractor:
         return goals
     
     def get_file_hash(self, file_path: Path) -> str:
-        """Get SHA256 hash of file for tracking changes"""
-        sha256_hash = hashlib.sha256()
+        """Get short BLAKE2b hash of file for tracking changes"""
+        file_hash = hashlib.blake2b(digest_size=8)
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()[:16]  # Short hash
+            for byte_block in iter(lambda: f.read(65536), b""):
+                file_hash.update(byte_block)
+        return file_hash.hexdigest()  # Short hash
     
     def save_goals(self, goals_data: Dict):
         """Save extracted goals to JSON"""
@@ -68,6 +68,7 @@ class GlobalObsidianSync:
             self.manifest = {
                 "last_sync": None,
                 "synced_files": {},
+                "file_stats": {},
                 "sync_counts": {},
                 "indexes": {}
             }
@@ -79,15 +80,29 @@ class GlobalObsidianSync:
             json.dump(self.manifest, f, indent=2)
     
     def get_file_hash(self, file_path: Path) -> str:
-        """Get hash of file to detect changes"""
-        if not file_path.exists():
+        """Get hash of file to detect changes.
+        
+        Hashes are memoized in the manifest against (mtime_ns, size), so
+        files untouched since the last sync are not read again.
+        """
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             return ""
         
-        sha256_hash = hashlib.sha256()
+        file_stats = self.manifest.setdefault("file_stats", {})
+        cached = file_stats.get(str(file_path))
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        # blake2b is faster than sha256 and yields the 16 hex chars directly
+        file_hash = hashlib.blake2b(digest_size=8)
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()[:16]
+            for byte_block in iter(lambda: f.read(65536), b""):
+                file_hash.update(byte_block)
+        digest = file_hash.hexdigest()
+        file_stats[str(file_path)] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
     
     def sync_all(self, force: bool = False) -> Dict:
         """
@@ -437,7 +452,7 @@ class GlobalObsidianSync:
         content.append("## 📅 Recent Activity\n")
         recent_files = sorted(
             self.obs_brain.rglob("*.md"),
-            key=lambda x: x.stat().st_mtime,
+            key=lambda x: x.stat().st_mtime_ns,
             reverse=True
         )[:10]
         
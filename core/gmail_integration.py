@@ -6,6 +6,7 @@ Provides actual Gmail API functionality for job application tracking
 
 import os
 import json
+import base64
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -130,7 +131,7 @@ class GmailAnalyzer:
                     analysis['companies'].add(company)
                 
                 # Categorize email
-                if any(re.search(pattern, body) or re.search(pattern, subject) 
+                if any(re.search(pattern, subject) or re.search(pattern, body) 
                        for pattern in interview_patterns):
                     analysis['interviews_scheduled'] += 1
                     # Try to extract interview date/time
@@ -138,11 +139,11 @@ class GmailAnalyzer:
                     if interview_info:
                         analysis['next_interviews'].append(interview_info)
                         
-                elif any(re.search(pattern, body) or re.search(pattern, subject) 
+                elif any(re.search(pattern, subject) or re.search(pattern, body) 
                          for pattern in rejection_patterns):
                     analysis['rejections'] += 1
                     
-                elif any(re.search(pattern, body) or re.search(pattern, subject) 
+                elif any(re.search(pattern, subject) or re.search(pattern, body) 
                          for pattern in reply_patterns):
                     analysis['replies_received'] += 1
                 else:
@@ -209,10 +210,11 @@ class GmailAnalyzer:
             body = ''
             
             if 'parts' in payload:
-                for part in payload['parts']:
-                    if part['mimeType'] == 'text/plain':
-                        data = part['body']['data']
-                        body += self._decode_base64(data)
+                body = ''.join(
+                    self._decode_base64(part['body']['data'])
+                    for part in payload['parts']
+                    if part['mimeType'] == 'text/plain'
+                )
             elif payload['body'].get('data'):
                 body = self._decode_base64(payload['body']['data'])
                 
@@ -222,7 +224,6 @@ class GmailAnalyzer:
     
     def _decode_base64(self, data) -> str:
         """Decode base64 email data"""
-        import base64
         return base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
     
     def _extract_company_name(self, from_email: str, subject: str) -> Optional[str]:
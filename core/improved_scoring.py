@@ -4,13 +4,31 @@ Improved scoring algorithm based on POC findings
 """
 
 import json
+import string
+from functools import lru_cache
 from pathlib import Path
 import sys
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Tuple
 sys.path.append('/Users/tarive/brain-poc/scripts')
 
 from poc_scoring import BrainPOCScoring
 
+# Punctuation becomes whitespace before splitting, so "Dr." indexes as "dr"
+_TOKEN_TABLE = str.maketrans({c: ' ' for c in string.punctuation})
+
+
+def _tokenize(text: str) -> List[str]:
+    return text.lower().translate(_TOKEN_TABLE).split()
+
+
+@lru_cache(maxsize=256)
+def _query_terms(query: str) -> Tuple[str, FrozenSet[str], Tuple[str, ...]]:
+    """Lowercased query, its word set and two-word phrases, parsed once per query"""
+    query_lower = query.lower()
+    words = query_lower.split()
+    phrases = tuple(f"{words[i]} {words[i+1]}" for i in range(len(words) - 1))
+    return query_lower, frozenset(words), phrases
+
 class ImprovedBrainScoring(BrainPOCScoring):
     def __init__(self, poc_dir: str = "/Users/tarive/brain-poc"):
         super().__init__(poc_dir)
@@ -30,25 +48,59 @@ class ImprovedBrainScoring(BrainPOCScoring):
                 "context_match": 0.2
             }
         })
+        # id(item) -> (item, searchable text, word set); the item is kept so
+        # its id can't be reused while cached. Cleared on every reload.
+        self._text_cache = {}
+        # token -> item positions, filled by _build_inverted_index()
+        self._postings = {}
     
-    def _calculate_semantic_similarity(self, item: Dict, query: str) -> float:
-        """Enhanced semantic similarity with phrase matching and context awareness"""
+    def _load_all_items(self) -> List[Dict]:
+        self._text_cache.clear()
+        return super()._load_all_items()
+    
+    def _searchable(self, item: Dict) -> Tuple[str, FrozenSet[str]]:
+        """Content, context and tags as one lowercased string plus its word set"""
+        cached = self._text_cache.get(id(item))
+        if cached is not None and cached[0] is item:
+            return cached[1], cached[2]
         content = item.get("content", "").lower()
         context = str(item.get("context", {})).lower()
         tags = " ".join(item.get("tags", [])).lower()
-        query_lower = query.lower()
-        
-        # Combine all searchable text
         full_text = f"{content} {context} {tags}"
-        
-        # Base word overlap
-        query_words = set(query_lower.split())
-        content_words = set(full_text.split())
+        words = frozenset(full_text.split())
+        self._text_cache[id(item)] = (item, full_text, words)
+        return full_text, words
+    
+    def _build_inverted_index(self, items: List[Dict]) -> Dict[str, List[int]]:
+        """Index items by content token: token -> ascending item positions"""
+        self._postings = {}
+        for position, item in enumerate(items):
+            for token in set(_tokenize(item.get("content", ""))):
+                self._postings.setdefault(token, []).append(position)
+        return self._postings
+    
+    def _lookup(self, text: str) -> List[int]:
+        """Positions of indexed items whose content has every token of text"""
+        tokens = _tokenize(text)
+        if not tokens:
+            return []
+        # Start from the shortest posting list to keep the intersection small
+        postings = sorted((self._postings.get(token, []) for token in set(tokens)), key=len)
+        matches = set(postings[0]).intersection(*postings[1:])
+        return sorted(matches)
+    
+    def _calculate_semantic_similarity(self, item: Dict, query: str) -> float:
+        """Enhanced semantic similarity with phrase matching and context awareness"""
+        # Item text and query terms are each built once and reused across
+        # the item x query grid, so only the overlap and boosts run per pair
+        full_text, content_words = self._searchable(item)
+        query_lower, query_words, query_phrases = _query_terms(query)
         
         if not query_words:
             return 0.0
         
-        overlap = len(query_words.intersection(content_words))
+        # Base word overlap
+        overlap = len(query_words & content_words)
         base_similarity = overlap / len(query_words)
         
         # Boost factors
@@ -59,7 +111,6 @@ class ImprovedBrainScoring(BrainPOCScoring):
             similarity_boost += self.config["semantic_boost_factors"]["exact_phrase"]
         
         # Partial phrase matches
-        query_phrases = self._get_query_phrases(query_lower)
         for phrase in query_phrases:
             if phrase in full_text and phrase not in query_lower:  # Avoid double counting
                 similarity_boost += self.config["semantic_boost_factors"]["partial_phrase"]
@@ -71,17 +122,6 @@ class ImprovedBrainScoring(BrainPOCScoring):
         final_similarity = min(base_similarity + similarity_boost, 1.0)
         return final_similarity
     
-    def _get_query_phrases(self, query: str) -> List[str]:
-        """Extract meaningful phrases from query"""
-        words = query.split()
-        phrases = []
-        
-        # Two-word phrases
-        for i in range(len(words) - 1):
-            phrases.append(f"{words[i]} {words[i+1]}")
-        
-        return phrases
-    
     def _has_context_alignment(self, item: Dict, query: str) -> bool:
         """Check for contextual alignment between query and item"""
         context = item.get("context", {})
@@ -27,6 +27,12 @@ EOF
 
 chmod +x "$BRAIN_DIR/cron_backup.sh"
 
+# Let git's own file watcher answer auto_commit's `git status` probe:
+# with fsmonitor + untracked cache (git >= 2.36) it only looks at paths
+# that actually changed instead of re-scanning the whole tree every hour
+git -C "$BRAIN_DIR" config core.fsmonitor true
+git -C "$BRAIN_DIR" config core.untrackedCache true
+
 # Check if cron job already exists
 if crontab -l 2>/dev/null | grep -q "cron_backup.sh"; then
     echo "✅ Cron job already exists"
@@ -102,6 +102,14 @@ class UnifiedXMLBrain:
         xml_pattern = r'<(\w+)>(.*?)</\1>'
         xml_matches = re.findall(xml_pattern, input_text, re.DOTALL)
         
+        # Remove XML tags from original text for clean content
+        clean_text = re.sub(xml_pattern, '', input_text).strip()
+        
+        return self._build_entry(clean_text, xml_matches)
+
+    def _build_entry(self, clean_text: str, xml_matches: List[Tuple[str, str]]) -> BrainEntry:
+        """Build a brain entry from already-extracted (tag, content) pairs
+        and the input text with those tags removed"""
         xml_tags = []
         extracted_content = []
         
@@ -109,8 +117,7 @@ class UnifiedXMLBrain:
             xml_tags.append(tag)
             extracted_content.append(f"{tag}: {content.strip()}")
         
-        # Remove XML tags from original text for clean content
-        clean_content = re.sub(xml_pattern, '', input_text).strip()
+        clean_content = clean_text
         if extracted_content:
             clean_content += "\n\n" + "\n".join(extracted_content)
         
@@ -4,12 +4,20 @@ Enhanced XML Brain System with Natural Language Processing
 Supports <remind>, intelligent Gmail analysis, and automatic date/time parsing
 """
 
+import os
 import re
 import json
+import select
 import subprocess
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
+
+try:
+    import ahocorasick  # pyahocorasick: one scan finds every intent keyword
+except ImportError:
+    ahocorasick = None
 # Use built-in datetime instead of external dependencies
 # import dateutil.parser
 # import pytz
@@ -17,6 +25,66 @@ from pathlib import Path
 # Import the existing unified brain system
 from unified_xml_brain import UnifiedXMLBrain, BrainEntry
 
+# XML tag pairs: <tag>content</tag>
+_XML_PATTERN = re.compile(r'<(\w+)>(.*?)</\1>', re.DOTALL)
+
+# Reminder time: "[at ]H:MM [am|pm] [zone]" or "at H am|pm", one scan.
+# A missing minute group marks the hour-only form.
+_TIME_RE = re.compile(
+    r'(?:at )?(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*(?P<ampm>pm|am)?\s*(?P<tz>CST|CDT|EST|PST)?'
+    r'|at (?P<hour_only>\d{1,2})\s*(?P<hour_ampm>pm|am)',
+    re.IGNORECASE
+)
+
+# Reminder dates: tomorrow, today, 12/25, december 25
+_DATE_RE = re.compile(
+    r'tomorrow|today|(\d{1,2})/(\d{1,2})'
+    r'|(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})',
+    re.IGNORECASE
+)
+# Every time form and the numeric date forms need a digit; reminders
+# without one skip those scans
+_DIGIT_RE = re.compile(r'\d')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Gmail request intents
+_JOB_REQUEST_RE = re.compile(r'job\s+application|application\s+repl|interview|hiring|recruiter', re.IGNORECASE)
+_FOUNDER_REQUEST_RE = re.compile(r'founder|startup|partnership|collaboration|business|entrepreneur', re.IGNORECASE)
+_REPLY_REQUEST_RE = re.compile(r'repl|response|got back|heard back', re.IGNORECASE)
+
+# The same intents as lowercase keywords for the automaton, which is run
+# over the request with its whitespace collapsed to single spaces
+_GMAIL_INTENT_KEYWORDS = {
+    "job": ("job application", "application repl", "interview", "hiring", "recruiter"),
+    "founder": ("founder", "startup", "partnership", "collaboration", "business", "entrepreneur"),
+    "reply": ("repl", "response", "got back", "heard back"),
+}
+_GMAIL_INTENT_RES = (("job", _JOB_REQUEST_RE), ("founder", _FOUNDER_REQUEST_RE), ("reply", _REPLY_REQUEST_RE))
+
+_GMAIL_INTENT_AUTOMATON = None
+if ahocorasick is not None:
+    _GMAIL_INTENT_AUTOMATON = ahocorasick.Automaton()
+    for _intent, _keywords in _GMAIL_INTENT_KEYWORDS.items():
+        for _keyword in _keywords:
+            _GMAIL_INTENT_AUTOMATON.add_word(_keyword, _intent)
+    _GMAIL_INTENT_AUTOMATON.make_automaton()
+
+
+def _gmail_intents(content: str) -> Set[str]:
+    """Intents ('job', 'founder', 'reply') whose keywords appear in content"""
+    if _GMAIL_INTENT_AUTOMATON is None:
+        return {intent for intent, pattern in _GMAIL_INTENT_RES if pattern.search(content)}
+    text = ' '.join(content.lower().split())
+    return {intent for _, intent in _GMAIL_INTENT_AUTOMATON.iter(text)}
+
+# Echoed by the osascript coprocess after each statement; reading up to it
+# marks the statement as finished
+_OSA_SENTINEL = "__BRAIN_OSA_DONE__"
+# Echoed after each reminder in a batch so errors can be traced to it
+_REMINDER_MARK = "__BRAIN_REMINDER_DONE__"
+_OSA_TIMEOUT = 30
+
 class EnhancedXMLBrain(UnifiedXMLBrain):
     """Enhanced brain system with natural language processing"""
     
@@ -25,6 +93,11 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
         # Use timezone offset for CST (-6) and CDT (-5)
         self.cst_offset = timedelta(hours=-6)  # CST timezone offset
         
+        # Long-lived `osascript -i`, started on the first reminder
+        self._osa_proc = None
+        # Gmail analyzer, looked up on first use; False if gmail_integration is missing
+        self._gmail_analyzer = None
+        
         # Enhanced XML tag configuration
         self.enhanced_tags = {
             "remind": {
@@ -43,39 +116,31 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
 
     def parse_enhanced_xml_input(self, input_text: str) -> BrainEntry:
         """Parse XML input with enhanced natural language processing"""
-        # Extract all XML tags with enhanced processing
-        xml_pattern = r'<(\w+)>(.*?)</\1>'
-        xml_matches = re.findall(xml_pattern, input_text, re.DOTALL)
+        # Extract all XML tags and strip them from the text in the same pass
+        xml_matches = []
+        
+        def _take_tag(match):
+            xml_matches.append(match.groups())
+            return ''
+        
+        stripped_text = _XML_PATTERN.sub(_take_tag, input_text).strip()
         
-        xml_tags = []
-        processed_content = []
         integrations_needed = []
         
         for tag, content in xml_matches:
-            xml_tags.append(tag)
             clean_content = content.strip()
             
             # Enhanced processing for specific tags
             if tag == "remind":
                 reminder_data = self._parse_reminder_content(clean_content)
-                processed_content.append(f"reminder: {reminder_data['task']} at {reminder_data['datetime_str']}")
                 integrations_needed.append(("apple_reminders", reminder_data))
                 
             elif tag == "gmail":
                 gmail_data = self._parse_gmail_request(clean_content)
-                processed_content.append(f"gmail: {gmail_data['request_type']} - {clean_content}")
                 integrations_needed.append(("gmail_mcp", gmail_data))
-                
-            else:
-                processed_content.append(f"{tag}: {clean_content}")
-        
-        # Remove XML tags from original text for clean content
-        clean_content = re.sub(xml_pattern, '', input_text).strip()
-        if processed_content:
-            clean_content += "\n\n" + "\n".join(processed_content)
         
-        # Create enhanced brain entry
-        entry = super().parse_xml_input(input_text)
+        # Create enhanced brain entry from the tags already extracted above
+        entry = self._build_entry(stripped_text, xml_matches)
         
         # Add integration metadata
         if integrations_needed:
@@ -86,84 +151,48 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
 
     def _parse_reminder_content(self, content: str) -> Dict:
         """Parse natural language reminder content and extract datetime"""
-        # Common time patterns
-        time_patterns = [
-            r'at (\d{1,2}):(\d{2})\s*(pm|am)\s*(CST|CDT|EST|PST)?',  # at 2:30pm CST or at 14:45 pm CST
-            r'at (\d{1,2}):(\d{2})\s*(CST|CDT|EST|PST)?',           # at 14:45 CST
-            r'at (\d{1,2})\s*(pm|am)',                               # at 2pm
-            r'(\d{1,2}):(\d{2})\s*(pm|am)\s*(CST|CDT|EST|PST)?',    # 2:30pm CST or 14:45 pm CST
-            r'(\d{1,2}):(\d{2})\s*(CST|CDT|EST|PST)?',              # 14:45 CST
-        ]
-        
-        # Date patterns
-        date_patterns = [
-            r'tomorrow',
-            r'today',
-            r'(\d{1,2})/(\d{1,2})',                        # 12/25
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})',
-        ]
-        
         # Extract time
         time_info = None
         timezone_info = None
         
-        for pattern in time_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                
-                # Handle different pattern formats
-                if pattern == time_patterns[2]:  # at 2pm pattern (hour only)
-                    hour = int(groups[0])
-                    minute = 0  # Default minute for hour-only patterns
-                    timezone_or_ampm = groups[1].upper() if len(groups) > 1 else None
-                    timezone_info = None
-                else:
-                    # Hour:minute patterns
-                    hour = int(groups[0])
-                    minute = int(groups[1]) if len(groups) > 1 else 0
-                    
-                    # Look for AM/PM and timezone in the groups
-                    timezone_or_ampm = None
-                    timezone_info = None
-                    
-                    for group in groups[2:]:  # Check groups after hour and minute
-                        if group and group.upper() in ['PM', 'AM']:
-                            timezone_or_ampm = group.upper()
-                        elif group and group.upper() in ['CST', 'CDT', 'EST', 'PST']:
-                            timezone_info = group.upper()
-                
-                # Handle AM/PM conversion, be smart about 24-hour format
-                if timezone_or_ampm and timezone_or_ampm in ['PM', 'AM']:
-                    if hour > 12:  # 24-hour format like 14:45, convert to 12-hour equivalent
-                        hour_12 = hour - 12
-                        # If they said PM and it's afternoon (13-23), keep as PM
-                        # If they said AM and it's afternoon, it's probably a mistake, use PM
-                        if timezone_or_ampm == 'PM':
-                            hour = hour  # Keep 24-hour format (14:45 PM = 14:45)
-                        else:  # AM with 24-hour is confusing, assume they meant the 12-hour equivalent
-                            hour = hour_12 if hour_12 > 0 else 12
-                    else:  # Standard 12-hour format
-                        if timezone_or_ampm == 'PM' and hour < 12:
-                            hour += 12
-                        elif timezone_or_ampm == 'AM' and hour == 12:
-                            hour = 0
-                
-                time_info = (hour, minute)
-                break
+        has_digit = _DIGIT_RE.search(content) is not None
+        content_lower = content.lower()
         
-        # Extract date (default to today)
-        target_date = datetime.now().date()
+        match = _TIME_RE.search(content) if has_digit else None
+        if match:
+            if match.group('minute') is None:  # at 2pm pattern (hour only)
+                hour = int(match.group('hour_only'))
+                minute = 0  # Default minute for hour-only patterns
+                timezone_or_ampm = match.group('hour_ampm').upper()
+            else:
+                hour = int(match.group('hour'))
+                minute = int(match.group('minute'))
+                timezone_or_ampm = match.group('ampm') and match.group('ampm').upper()
+                timezone_info = match.group('tz') and match.group('tz').upper()
+            
+            # Handle AM/PM conversion, be smart about 24-hour format
+            if timezone_or_ampm and timezone_or_ampm in ['PM', 'AM']:
+                if hour > 12:  # 24-hour format like 14:45, convert to 12-hour equivalent
+                    hour_12 = hour - 12
+                    # If they said PM and it's afternoon (13-23), keep as PM
+                    # If they said AM and it's afternoon, it's probably a mistake, use PM
+                    if timezone_or_ampm == 'PM':
+                        hour = hour  # Keep 24-hour format (14:45 PM = 14:45)
+                    else:  # AM with 24-hour is confusing, assume they meant the 12-hour equivalent
+                        hour = hour_12 if hour_12 > 0 else 12
+                else:  # Standard 12-hour format
+                    if timezone_or_ampm == 'PM' and hour < 12:
+                        hour += 12
+                    elif timezone_or_ampm == 'AM' and hour == 12:
+                        hour = 0
+            
+            time_info = (hour, minute)
         
-        for pattern in date_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                if match.group(0).lower() == 'tomorrow':
-                    target_date = target_date + timedelta(days=1)
-                elif match.group(0).lower() == 'today':
-                    pass  # already set to today
-                # Add more date parsing as needed
-                break
+        # Extract date (default to today); of the date forms only
+        # 'tomorrow' moves it so far, so that is all that is looked for
+        target_date = datetime.now().date()
+        if 'tomorrow' in content_lower:
+            target_date = target_date + timedelta(days=1)
         
         # Combine date and time
         if time_info:
@@ -179,10 +208,12 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
         
         # Extract the task (remove time/date references)
         task = content
-        for pattern in time_patterns + date_patterns:
-            task = re.sub(pattern, '', task, flags=re.IGNORECASE)
+        if has_digit:
+            task = _TIME_RE.sub('', task)
+        if has_digit or 'tomorrow' in content_lower or 'today' in content_lower:
+            task = _DATE_RE.sub('', task)
         
-        task = re.sub(r'\s+', ' ', task).strip()  # Clean up whitespace
+        task = _WHITESPACE_RE.sub(' ', task).strip()  # Clean up whitespace
         
         return {
             'task': task,
@@ -195,19 +226,20 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
         """Parse Gmail analysis requests"""
         request_type = "general"
         search_terms = []
+        intents = _gmail_intents(content)
         
         # Job application patterns
-        if re.search(r'job\s+application|application\s+repl|interview|hiring|recruiter', content, re.IGNORECASE):
+        if "job" in intents:
             request_type = "job_applications"
             search_terms = ["job", "application", "interview", "position", "role", "hiring", "recruiter"]
         
         # Founder/startup patterns  
-        elif re.search(r'founder|startup|partnership|collaboration|business|entrepreneur', content, re.IGNORECASE):
+        elif "founder" in intents:
             request_type = "founders"
             search_terms = ["founder", "startup", "partnership", "collaboration", "CEO", "entrepreneur"]
         
         # Reply analysis
-        if re.search(r'repl|response|got back|heard back', content, re.IGNORECASE):
+        if "reply" in intents:
             request_type += "_replies"
         
         return {
@@ -232,63 +264,137 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
         entry_id = self.store_entry(entry, sync_to_legacy=True)
         
         if execute_integrations and hasattr(entry, 'metadata') and 'integrations' in entry.metadata:
-            for integration_type, integration_data in entry.metadata['integrations']:
-                if integration_type == "apple_reminders":
-                    self._execute_reminder_integration(integration_data, entry_id)
-                elif integration_type == "gmail_mcp":
-                    self._execute_gmail_integration(integration_data, entry_id)
+            integrations = entry.metadata['integrations']
+            # One timestamp for every result entry this store produces
+            now_iso = datetime.now(timezone.utc).isoformat()
+            # All of the entry's reminders go to osascript in one round trip
+            reminders = [data for kind, data in integrations if kind == "apple_reminders"]
+            if reminders:
+                self._execute_reminder_integration(reminders, entry_id, now_iso=now_iso)
+            for integration_type, integration_data in integrations:
+                if integration_type == "gmail_mcp":
+                    self._execute_gmail_integration(integration_data, entry_id, now_iso=now_iso)
         
         return entry_id
 
-    def _execute_reminder_integration(self, reminder_data: Dict, entry_id: int):
-        """Execute Apple Reminders integration using MCP format"""
+    def _execute_reminder_integration(self, reminders: List[Dict], entry_id: int,
+                                      now_iso: Optional[str] = None):
+        """Execute Apple Reminders integration using MCP format, one script for the batch"""
         try:
-            # Format the datetime as expected by Apple Reminders MCP: YYYY-MM-DD HH:mm:ss
-            target_datetime = reminder_data['datetime']
-            mcp_datetime_format = target_datetime.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Use the proper MCP format for AppleScript date - this mimics what the MCP server does
-            applescript_date = target_datetime.strftime('%B %d, %Y %I:%M:%S %p')  # December 11, 2025 2:45:00 PM
+            now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+            # Create AppleScript for adding reminders (following MCP server patterns).
+            # One statement per line: the osascript coprocess runs input line by line
+            lines = []
+            for reminder_data in reminders:
+                # Build the AppleScript due date from numbers rather than a month-name
+                # string, which AppleScript parses according to the system locale.
+                # Day goes to 1 first so changing the month can't overflow it.
+                year, month, day, hour, minute, second = reminder_data['datetime'].timetuple()[:6]
+                task = reminder_data['task'].replace('\\', '\\\\').replace('"', '\\"')
+                lines += [
+                    'set dueDate to current date',
+                    'set day of dueDate to 1',
+                    f'set year of dueDate to {year}',
+                    f'set month of dueDate to {month}',
+                    f'set day of dueDate to {day}',
+                    f'set time of dueDate to {hour * 3600 + minute * 60 + second}',
+                    f'tell application "Reminders" to make new reminder in list "Reminders" '
+                    f'with properties {{name:"{task}", due date:dueDate, completed:false}}',
+                    f'"{_REMINDER_MARK}"',
+                ]
             
-            # Create AppleScript for adding reminder (following MCP server patterns)
-            applescript = f'''
-            tell application "Reminders"
-                set targetList to list "Reminders"
-                set newReminder to make new reminder in targetList
-                set name of newReminder to "{reminder_data['task']}"
-                set due date of newReminder to (date "{applescript_date}")
-                set completed of newReminder to false
-            end tell
-            '''
+            ok, output = self._run_applescript('\n'.join(lines))
             
-            # Execute AppleScript using osascript
+            # Segment i holds reminder i's output; it is complete only if its
+            # mark was echoed, so a batch cut short fails the unfinished ones
+            segments = output.split(_REMINDER_MARK)
+            for i, reminder_data in enumerate(reminders):
+                # Format the datetime as expected by Apple Reminders MCP: YYYY-MM-DD HH:mm:ss
+                mcp_datetime_format = reminder_data['datetime'].strftime('%Y-%m-%d %H:%M:%S')
+                
+                done = i < len(segments) - 1
+                errors = [line.strip() for line in segments[min(i, len(segments) - 1)].splitlines() if 'error:' in line]
+                if ok or (done and not errors):
+                    print(f"✅ Reminder set: {reminder_data['task']} at {mcp_datetime_format}")
+                    # Store success in brain
+                    self.store_entry(BrainEntry(
+                        content=f"Successfully set Apple reminder: {reminder_data['task']} at {mcp_datetime_format}",
+                        xml_tags=['b'],
+                        dimensions=['personal'],
+                        timestamp=now_iso,
+                        importance=0.6,
+                        connections=[str(entry_id)]
+                    ), sync_to_legacy=False)
+                else:
+                    reason = '; '.join(errors) if done else (output.strip() or "no response from osascript")
+                    print(f"⚠️ Reminder setup failed: {reminder_data['task']}: {reason}")
+                
+        except Exception as e:
+            print(f"❌ Reminder integration error: {e}")
+
+    def _run_applescript(self, script: str) -> Tuple[bool, str]:
+        """Run AppleScript, one statement per line, on the shared osascript process.
+        
+        Returns (succeeded, output). If the coprocess can't be started or
+        written to, the script runs in a one-off `osascript -e` instead.
+        """
+        try:
+            if self._osa_proc is None or self._osa_proc.poll() is not None:
+                self._osa_proc = subprocess.Popen(
+                    ['osascript', '-i'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    bufsize=0
+                )
+            self._osa_proc.stdin.write(f'{script}\n"{_OSA_SENTINEL}"\n'.encode())
+        except OSError:
+            self._close_osascript()
             result = subprocess.run(
-                ['osascript', '-e', applescript],
+                ['osascript', '-e', script],
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=_OSA_TIMEOUT
             )
-            
-            if result.returncode == 0:
-                print(f"✅ Reminder set: {reminder_data['task']} at {mcp_datetime_format}")
-                # Store success in brain
-                self.store_entry(BrainEntry(
-                    content=f"Successfully set Apple reminder: {reminder_data['task']} at {mcp_datetime_format}",
-                    xml_tags=['b'],
-                    dimensions=['personal'],
-                    timestamp=datetime.now(timezone.utc).isoformat(),
-                    importance=0.6,
-                    connections=[str(entry_id)]
-                ), sync_to_legacy=False)
-            else:
-                print(f"⚠️ Reminder setup failed: {result.stderr}")
-                
-        except Exception as e:
-            print(f"❌ Reminder integration error: {e}")
+            return result.returncode == 0, result.stderr
+        
+        # Errors come back on the merged stream ahead of the sentinel
+        output = b''
+        fd = self._osa_proc.stdout.fileno()
+        deadline = time.monotonic() + _OSA_TIMEOUT
+        while _OSA_SENTINEL.encode() not in output:
+            remaining = deadline - time.monotonic()
+            chunk = b''
+            if remaining > 0 and select.select([fd], [], [], remaining)[0]:
+                chunk = os.read(fd, 4096)
+            if not chunk:  # timed out or osascript exited
+                self._close_osascript()
+                return False, output.decode(errors='replace') or "osascript did not respond"
+            output += chunk
+        
+        text = output.decode(errors='replace').split(_OSA_SENTINEL)[0]
+        return 'error:' not in text, text.strip()
 
-    def _execute_gmail_integration(self, gmail_data: Dict, entry_id: int):
+    def _close_osascript(self):
+        """Stop the osascript coprocess, if one is running"""
+        proc, self._osa_proc = self._osa_proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()  # osascript -i exits at end of input
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+
+    def __del__(self):
+        if getattr(self, '_osa_proc', None) is not None:
+            self._close_osascript()
+
+    def _execute_gmail_integration(self, gmail_data: Dict, entry_id: int,
+                                   now_iso: Optional[str] = None):
         """Execute Gmail MCP integration"""
         try:
+            now_iso = now_iso or datetime.now(timezone.utc).isoformat()
             action = gmail_data['action']
             
             if action == "analyze_job_replies":
@@ -305,7 +411,7 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
                 content=f"Gmail analysis: {result}",
                 xml_tags=['gmail'],
                 dimensions=['work'],
-                timestamp=datetime.now(timezone.utc).isoformat(),
+                timestamp=now_iso,
                 importance=0.8,
                 connections=[str(entry_id)]
             ), sync_to_legacy=False)
@@ -315,20 +421,25 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
         except Exception as e:
             print(f"❌ Gmail integration error: {e}")
 
+    def _get_analyzer(self):
+        """Gmail analyzer shared by the Gmail actions, or None without gmail_integration"""
+        if self._gmail_analyzer is None:
+            try:
+                from gmail_integration import get_gmail_analyzer
+                self._gmail_analyzer = get_gmail_analyzer()
+            except ImportError:
+                self._gmail_analyzer = False  # don't retry the import
+        return self._gmail_analyzer or None
+
     def _analyze_job_application_replies(self) -> str:
         """Analyze inbox for job application replies"""
         try:
             # Try to use actual Gmail integration
-            try:
-                from gmail_integration import get_gmail_analyzer
-                analyzer = get_gmail_analyzer()
-                
-                if analyzer.service:
-                    # Use actual Gmail API
-                    analysis = analyzer.analyze_job_applications()
-                    return analyzer.format_job_analysis(analysis)
-            except ImportError:
-                pass
+            analyzer = self._get_analyzer()
+            if analyzer and analyzer.service:
+                # Use actual Gmail API
+                analysis = analyzer.analyze_job_applications()
+                return analyzer.format_job_analysis(analysis)
             
             # Fallback to template if Gmail not available
             analysis = {
@@ -369,26 +480,21 @@ class EnhancedXMLBrain(UnifiedXMLBrain):
         """Search for founder-related emails"""
         try:
             # Try to use actual Gmail integration
-            try:
-                from gmail_integration import get_gmail_analyzer
-                analyzer = get_gmail_analyzer()
+            analyzer = self._get_analyzer()
+            if analyzer and analyzer.service:
+                # Use actual Gmail API
+                founder_data = analyzer.search_founder_emails()
+                result = f"🤝 Founder Communications Analysis:\n\n"
+                result += f"📧 Total founder emails: {founder_data['total_founder_emails']}\n"
+                result += f"📈 Time period: {founder_data['time_period']}\n\n"
                 
-                if analyzer.service:
-                    # Use actual Gmail API
-                    founder_data = analyzer.search_founder_emails()
-                    result = f"🤝 Founder Communications Analysis:\n\n"
-                    result += f"📧 Total founder emails: {founder_data['total_founder_emails']}\n"
-                    result += f"📈 Time period: {founder_data['time_period']}\n\n"
-                    
-                    if founder_data['founders']:
-                        result += "Recent founder contacts:\n"
-                        for founder in founder_data['founders'][:5]:
-                            result += f"• From: {founder['from'][:60]}\n"
-                            result += f"  Subject: {founder['subject'][:80]}\n\n"
-                    
-                    return result
-            except ImportError:
-                pass
+                if founder_data['founders']:
+                    result += "Recent founder contacts:\n"
+                    for founder in founder_data['founders'][:5]:
+                        result += f"• From: {founder['from'][:60]}\n"
+                        result += f"  Subject: {founder['subject'][:80]}\n\n"
+                
+                return result
             
             return f"Searching for founder emails with terms: {', '.join(search_terms)}"
         except Exception as e:
@@ -5,10 +5,14 @@ This is the core principle: Every operation syncs to Obsidian
 """
 
 import json
+import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+# Top-level brain files mirrored into Obsidian, grouped by suffix
+SYNC_SUFFIXES = (".md", ".py", ".sh", ".json")
 
 class ObsidianDeepSync:
     def __init__(self):
@@ -87,17 +91,29 @@ class ObsidianDeepSync:
         md_file.write_text("".join(content))
         return True
     
-    def sync_all_documentation(self):
+    def scan_brain_files(self) -> Dict[str, List[Path]]:
+        """Group top-level brain files by suffix in a single directory read"""
+        files = {suffix: [] for suffix in SYNC_SUFFIXES}
+        with os.scandir(self.brain_dir) as entries:
+            for entry in entries:
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix in files and entry.is_file():
+                    files[suffix].append(Path(entry.path))
+        return files
+    
+    def sync_all_documentation(self, files: Dict[str, List[Path]] = None):
         """Sync ALL documentation to Obsidian"""
         docs_synced = 0
+        if files is None:
+            files = self.scan_brain_files()
         
         # Sync all markdown files
-        for md_file in self.brain_dir.glob("*.md"):
+        for md_file in files[".md"]:
             if self.sync_file(md_file, "documentation"):
                 docs_synced += 1
         
         # Sync all Python files as documentation
-        for py_file in self.brain_dir.glob("*.py"):
+        for py_file in files[".py"]:
             # Create markdown version with code
             md_content = f"# {py_file.stem}\n\n```python\n{py_file.read_text()}\n```"
             md_file = self.obsidian_dir / "documentation" / f"{py_file.stem}.md"
@@ -105,7 +121,7 @@ class ObsidianDeepSync:
             docs_synced += 1
         
         # Sync shell scripts
-        for sh_file in self.brain_dir.glob("*.sh"):
+        for sh_file in files[".sh"]:
             md_content = f"# {sh_file.stem}\n\n```bash\n{sh_file.read_text()}\n```"
             md_file = self.obsidian_dir / "documentation" / f"{sh_file.stem}.md"
             md_file.write_text(md_content)
@@ -144,12 +160,13 @@ class ObsidianDeepSync:
 def deep_sync_everything():
     """Master sync function - call this from EVERYWHERE"""
     syncer = ObsidianDeepSync()
+    files = syncer.scan_brain_files()
     
     # Sync all documentation
-    syncer.sync_all_documentation()
+    syncer.sync_all_documentation(files)
     
     # Sync JSON files as markdown
-    for json_file in Path("/Users/tarive/brain-poc").glob("*.json"):
+    for json_file in files[".json"]:
         if not json_file.name.startswith('.'):
             syncer.sync_json_as_markdown(json_file, "working-memory")
     
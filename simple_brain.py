@@ -197,13 +197,17 @@ class SimpleBrain:
         if include_other_sessions:
             # List other active sessions (modified in last hour)
             active_sessions = []
-            cutoff = time.time() - 3600  # 1 hour
+            cutoff_ns = time.time_ns() - 3600 * 10**9  # 1 hour
             
             for session_dir in self.sessions_dir.iterdir():
                 if session_dir.is_dir():
                     wm_file = session_dir / "working_memory.json"
-                    if wm_file.exists() and wm_file.stat().st_mtime > cutoff:
-                        active_sessions.append(session_dir.name)
+                    try:
+                        # One stat, integer nanoseconds: no exists() + float mtime
+                        if wm_file.stat().st_mtime_ns > cutoff_ns:
+                            active_sessions.append(session_dir.name)
+                    except FileNotFoundError:
+                        continue
             
             context['active_sessions'] = active_sessions
             context['total_active'] = len(active_sessions)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Auto-Commit Backup System
+Runs against a throwaway git repository via the brain_dir override
+"""
+
+import unittest
+import tempfile
+import shutil
+import subprocess
+import os
+import json
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import sys
+sys.path.insert(0, '/Users/tarive/brain-poc')
+
+import auto_commit
+from auto_commit import AutoCommit
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Brain Test",
+    "GIT_AUTHOR_EMAIL": "brain@test.local",
+    "GIT_COMMITTER_NAME": "Brain Test",
+    "GIT_COMMITTER_EMAIL": "brain@test.local",
+}
+
+
+class TestAutoCommit(unittest.TestCase):
+    """Test change detection and commit flow"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo = Path(self.temp_dir)
+        subprocess.run(["git", "init", "-q"], cwd=self.repo, check=True)
+
+        env = patch.dict(os.environ, GIT_IDENTITY)
+        env.start()
+        self.addCleanup(env.stop)
+        # No Obsidian sync or real push from unit tests
+        obsidian = patch.object(auto_commit, "_HAS_OBSIDIAN", False)
+        obsidian.start()
+        self.addCleanup(obsidian.stop)
+        self.pushes = []
+        real_popen = subprocess.Popen
+
+        def fake_push(args, *a, **kw):
+            if args[:2] == ["git", "push"]:
+                self.pushes.append(args)
+                return MagicMock()
+            return real_popen(args, *a, **kw)
+
+        popen = patch.object(auto_commit.subprocess, "Popen", side_effect=fake_push)
+        popen.start()
+        self.addCleanup(popen.stop)
+
+        self.auto = AutoCommit(self.repo)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _log(self):
+        result = subprocess.run(["git", "log", "--format=%s"], capture_output=True,
+                                text=True, cwd=self.repo)
+        return result.stdout.splitlines()
+
+    def test_brain_dir_override(self):
+        """Test: brain_dir argument controls repo and state file location"""
+        self.assertEqual(self.auto.brain_dir, self.repo)
+        self.assertEqual(self.auto.state_file, self.repo / ".auto_commit_state.json")
+
+    def test_no_changes_no_commit(self):
+        """Test: Clean tree does not trigger a commit"""
+        self.assertFalse(self.auto.should_commit())
+        self.assertFalse(self.auto.auto_commit())
+
+    def test_new_file_is_committed(self):
+        """Test: Untracked files are staged and committed"""
+        (self.repo / "notes.md").write_text("hello")
+
+        self.assertTrue(self.auto.auto_commit())
+        self.assertEqual(len(self._log()), 1)
+        self.assertIn("notes.md", subprocess.run(
+            ["git", "ls-files"], capture_output=True, text=True, cwd=self.repo).stdout)
+        self.assertEqual(len(self.pushes), 1)
+
+    def test_commit_interval_gate(self):
+        """Test: A recent commit blocks auto-commit but not force_commit"""
+        self.auto.state["last_commit"] = int(time.time())
+        (self.repo / "notes.md").write_text("hello")
+
+        self.assertFalse(self.auto.should_commit())
+        self.assertTrue(self.auto.force_commit("test"))
+        self.assertEqual(self._log(), ["Manual save: test"])
+
+    def test_state_saved_atomically(self):
+        """Test: State file is valid JSON and no temp file is left behind"""
+        (self.repo / "notes.md").write_text("hello")
+        self.auto.auto_commit()
+
+        state = json.loads(self.auto.state_file.read_text())
+        self.assertIsInstance(state["last_commit"], int)
+        self.assertEqual(state["total_commits"], 1)
+        self.assertFalse(self.auto.state_file.with_suffix(".json.tmp").exists())
+
+    def test_legacy_iso_timestamp_loaded(self):
+        """Test: ISO last_commit from older state files becomes an int"""
+        self.auto.state_file.write_text(json.dumps({
+            "last_commit": "2025-09-14T17:50:37.975857",
+            "last_hash": "4efd703996323d37a0a72f1b98ff73a0",
+            "commits_today": 12,
+            "total_commits": 12,
+        }))
+
+        state = AutoCommit(self.repo).state
+        self.assertIsInstance(state["last_commit"], int)
+
+    def test_status_counts_changes(self):
+        """Test: status() reports the number of uncommitted files"""
+        (self.repo / "a.md").write_text("a")
+        (self.repo / "b.md").write_text("b")
+
+        self.assertIn("Uncommitted changes: 2 files", self.auto.status())
+
+
+if __name__ == "__main__":
+    unittest.main()
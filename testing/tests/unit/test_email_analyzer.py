@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Gmail keyword scanning and email extractors
+Each check is held against the plain per-phrase `in` tests it replaced
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "cli" / "integrations" / "gmail"))
+
+from gmail_hybrid import GmailHybridAnalyzer, compile_keywords, keyword_hits
+import email_analyzer
+from email_analyzer import ComprehensiveEmailAnalyzer
+
+TPU_KEYWORDS = {
+    'relevant': ['credit', 'quota', 'tpu', 'research grant', 'academic credit'],
+    'expiration': ['expir', 'deadline', 'valid until', 'ends on'],
+    'quota': ['quota', 'limit', 'allocation'],
+    'credit_info': ['credit', 'grant', 'awarded'],
+    'date_slash': ['/'],
+    'month': list(email_analyzer._MONTHS),
+    'quota_value': ['quota', 'limit', 'usage', 'remaining', 'tpu'],
+}
+
+
+class TestKeywordScanner(unittest.TestCase):
+    """Test the single-pass scanner against per-phrase `in` checks"""
+
+    def assertSameLabels(self, groups, text):
+        expected = {label for label, phrases in groups.items() if any(p in text for p in phrases)}
+        self.assertEqual(keyword_hits(compile_keywords(groups), text), expected, text)
+
+    def test_overlapping_phrases_all_reported(self):
+        """Test: A phrase starting inside an earlier match is still found"""
+        groups = {'replies': ['thank you for your'], 'rejections': ['regret']}
+        self.assertSameLabels(groups, 'thank you for youregret')
+        self.assertSameLabels(TPU_KEYWORDS, 'valid untilimit')
+        self.assertSameLabels(TPU_KEYWORDS, 'academic creditpu')
+
+    def test_every_phrase_pair_joined(self):
+        """Test: Any two TPU phrases run together report the same labels"""
+        phrases = {p for ps in TPU_KEYWORDS.values() for p in ps}
+        for first in phrases:
+            for second in phrases:
+                for cut in range(4):
+                    self.assertSameLabels(TPU_KEYWORDS, first + second[cut:])
+
+
+def baseline_job_category(text):
+    """The original if/elif cascade of `in` checks"""
+    for category, phrases in email_analyzer._JOB_CATEGORY_KEYWORDS.items():
+        if any(phrase in text for phrase in phrases):
+            return category
+    return 'pending'
+
+
+class TestJobCategorization(unittest.TestCase):
+    """Test job email categories against the original cascade"""
+
+    def setUp(self):
+        self.analyzer = ComprehensiveEmailAnalyzer.__new__(ComprehensiveEmailAnalyzer)
+
+    def assertBaselineCategory(self, text):
+        self.assertEqual(self.analyzer._categorize_job_email(text), baseline_job_category(text), text)
+
+    def test_overlapped_interview_not_hidden(self):
+        """Test: 'checking interview' is an interview, not a follow-up"""
+        text = "hi, just checking interview availability for next week"
+        self.assertEqual(self.analyzer._categorize_job_email(text), 'interviews_scheduled')
+        self.assertBaselineCategory(text)
+
+    def test_every_phrase_pair_joined(self):
+        """Test: Any two category phrases run together pick the same category"""
+        phrases = {p for ps in email_analyzer._JOB_CATEGORY_KEYWORDS.values() for p in ps}
+        for first in phrases:
+            for second in phrases:
+                for cut in range(4):
+                    self.assertBaselineCategory(first + second[cut:])
+
+    def test_no_keywords_is_pending(self):
+        """Test: Text without any category phrase stays pending"""
+        self.assertBaselineCategory("lunch on friday?")
+
+
+class TestExtractors(unittest.TestCase):
+    """Test expiry and quota extraction"""
+
+    def setUp(self):
+        self.analyzer = ComprehensiveEmailAnalyzer.__new__(ComprehensiveEmailAnalyzer)
+
+    def extract_dates(self, text):
+        hits = keyword_hits(email_analyzer._TPU_SCANNER, text.lower())
+        return self.analyzer._extract_expiration_dates(text, hits)
+
+    def test_two_dates_both_found(self):
+        """Test: A date before 'expires' does not hide the date after it"""
+        dates = self.extract_dates("valid 1/2/2025, expires 3/4/2025")
+        self.assertIn("1/2/2025", dates)
+        self.assertIn("3/4/2025", dates)
+
+    def test_month_name_date(self):
+        """Test: Month-name dates are reported whole"""
+        self.assertEqual(self.extract_dates("Credits end December 31, 2025"), ["December 31, 2025"])
+
+    def test_no_date_markers(self):
+        """Test: Text without '/' or a month name has no dates"""
+        self.assertEqual(self.extract_dates("your credits expire soon"), [])
+
+    def test_quota_pattern_order(self):
+        """Test: The quota pattern wins over an earlier usage match"""
+        text = "usage 5 hours of your quota 10"
+        hits = keyword_hits(email_analyzer._TPU_SCANNER, text)
+        self.assertEqual(self.analyzer._extract_quota_info(text, hits)['value'], "10")
+
+
+class TestMessageBody(unittest.TestCase):
+    """Test body extraction from partial (fields-masked) messages"""
+
+    @staticmethod
+    def part(text=None):
+        part = {'mimeType': 'text/plain'}
+        if text is not None:
+            part['body'] = {'data': base64.urlsafe_b64encode(text.encode()).decode()}
+        return part
+
+    def test_part_without_body_keeps_other_parts(self):
+        """Test: A text part missing 'body' does not drop the collected text"""
+        gmail = GmailHybridAnalyzer.__new__(GmailHybridAnalyzer)
+        msg = {'payload': {'parts': [self.part('hello '), self.part(),
+                                     {'parts': [self.part('world')]}]}}
+        self.assertEqual(gmail._get_message_body(msg), 'hello world')
+
+
+class TestHandle401(unittest.TestCase):
+    """Test the Gmail session's 401 refresh-and-retry hook"""
+
+    def setUp(self):
+        self.gmail = GmailHybridAnalyzer.__new__(GmailHybridAnalyzer)
+        self.gmail.session = MagicMock()
+        self.gmail._refresh_lock = threading.Lock()
+        self.gmail.validation_path = Path(tempfile.gettempdir()) / "no-such-validation.json"
+        self.gmail._access_token = "old"
+        self.refreshes = 0
+
+        def refresh():
+            self.refreshes += 1
+            self.gmail._access_token = "new"
+            return True
+
+        self.gmail.refresh_access_token = refresh
+
+    def unauthorized(self, token):
+        request = MagicMock()
+        request.headers = {'Authorization': f"Bearer {token}"}
+        request.copy.return_value = SimpleNamespace(headers=dict(request.headers), hooks=None)
+        return SimpleNamespace(status_code=401, request=request)
+
+    def test_retry_keeps_send_options(self):
+        """Test: The retry is sent with the original timeout and verify"""
+        self.gmail._handle_401(self.unauthorized("old"), timeout=30, verify=True)
+        retry = self.gmail.session.send.call_args
+        self.assertEqual(retry.args[0].headers['Authorization'], "Bearer new")
+        self.assertEqual(retry.kwargs, {'timeout': 30, 'verify': True})
+
+    def test_concurrent_401s_refresh_once(self):
+        """Test: A 401 for an already replaced token retries without refreshing"""
+        self.gmail._handle_401(self.unauthorized("old"))
+        self.gmail._handle_401(self.unauthorized("old"))
+        self.assertEqual(self.refreshes, 1)
+        self.assertEqual(self.gmail.session.send.call_count, 2)
+
+
+class TestMessageCache(unittest.TestCase):
+    """Test the on-disk message cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.analyzer = ComprehensiveEmailAnalyzer.__new__(ComprehensiveEmailAnalyzer)
+        self.analyzer.cache_db = Path(self.temp_dir.name) / "cache" / "gmail_msgs.sqlite"
+        self.analyzer.gmail = SimpleNamespace(
+            batch_get_messages=MagicMock(side_effect=lambda ids, params: [{'id': i} for i in ids]))
+        self.analyzer.setup_cache()
+
+    def store(self, msg_id, fields, fetched_at):
+        with sqlite3.connect(self.analyzer.cache_db) as conn:
+            conn.execute("INSERT INTO message_cache VALUES (?, ?, ?, ?)",
+                         (msg_id, fields, fetched_at, json.dumps({'id': msg_id, 'cached': True})))
+
+    def test_cache_file_owner_only(self):
+        """Test: The cache file is readable by its owner only"""
+        self.assertEqual(stat.S_IMODE(os.stat(self.analyzer.cache_db).st_mode), 0o600)
+
+    def test_cached_message_served(self):
+        """Test: A message cached with the current fields mask is not refetched"""
+        self.store("a", email_analyzer.MESSAGE_FIELDS, time.time())
+        self.assertEqual(list(self.analyzer._get_messages(["a"])), [{'id': 'a', 'cached': True}])
+        self.analyzer.gmail.batch_get_messages.assert_called_once_with([], params={'fields': email_analyzer.MESSAGE_FIELDS})
+
+    def test_other_fields_mask_refetched(self):
+        """Test: A message cached under another fields mask is fetched again"""
+        self.store("a", "id,snippet", time.time())
+        self.assertEqual(list(self.analyzer._get_messages(["a"])), [{'id': 'a'}])
+
+    def test_expired_messages_pruned(self):
+        """Test: setup_cache drops messages older than MESSAGE_CACHE_TTL"""
+        self.store("old", email_analyzer.MESSAGE_FIELDS, time.time() - email_analyzer.MESSAGE_CACHE_TTL - 1)
+        self.analyzer.setup_cache()
+        with sqlite3.connect(self.analyzer.cache_db) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM message_cache").fetchone()[0], 0)
+
+
+class TestSearchAuthorization(unittest.TestCase):
+    """Test that searches follow the Gmail analyzer's current token"""
+
+    def setUp(self):
+        self.analyzer = ComprehensiveEmailAnalyzer.__new__(ComprehensiveEmailAnalyzer)
+        self.analyzer.gmail = SimpleNamespace(access_token="old")
+        self.analyzer._refresh_lock = threading.Lock()
+        self.analyzer.session = MagicMock()
+
+        def get(url, headers, **kwargs):
+            ok = headers["Authorization"] == "Bearer new"
+            return SimpleNamespace(status_code=200 if ok else 401)
+
+        self.analyzer.session.get.side_effect = get
+
+    def sent_tokens(self):
+        return [c.kwargs["headers"]["Authorization"] for c in self.analyzer.session.get.call_args_list]
+
+    def test_token_read_per_request(self):
+        """Test: A token refreshed elsewhere is used by the next search"""
+        self.analyzer.gmail.access_token = "new"
+        self.assertEqual(self.analyzer._get("url").status_code, 200)
+        self.assertEqual(self.sent_tokens(), ["Bearer new"])
+
+    def test_401_refreshes_and_retries(self):
+        """Test: A 401 refreshes the token once and retries with it"""
+        def refresh():
+            self.analyzer.gmail.access_token = "new"
+            return True
+
+        self.analyzer.gmail.refresh_access_token = refresh
+        self.assertEqual(self.analyzer._get("url").status_code, 200)
+        self.assertEqual(self.sent_tokens(), ["Bearer old", "Bearer new"])
+
+    def test_failed_refresh_returns_401(self):
+        """Test: Without a refresh the 401 response is returned as is"""
+        self.analyzer.gmail.refresh_access_token = lambda: False
+        self.assertEqual(self.analyzer._get("url").status_code, 401)
+        self.assertEqual(self.sent_tokens(), ["Bearer old"])
+
+
+if __name__ == "__main__":
+    unittest.main()
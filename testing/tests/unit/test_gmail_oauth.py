@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the OAuth Gmail analyzer
+Runs against a fake Gmail service; no network or credentials needed
+"""
+
+import base64
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "cli" / "integrations" / "gmail"))
+
+import gmail_oauth
+from gmail_oauth import GmailAnalyzer
+
+
+class FakeBatch:
+    """Batch request that answers each get from the service's mailbox"""
+
+    def __init__(self, service, callback):
+        self.service, self.callback, self.ids = service, callback, []
+
+    def add(self, request, request_id):
+        self.ids.append(request_id)
+
+    def execute(self):
+        self.service.batch_sizes.append(len(self.ids))
+        for msg_id in self.ids:
+            if self.service.failures.get(msg_id, 0) > 0:
+                self.service.failures[msg_id] -= 1
+                self.callback(msg_id, None, Exception("rateLimitExceeded"))
+            else:
+                self.callback(msg_id, {'id': msg_id, 'payload': {'headers': []}}, None)
+
+
+class FakeService:
+    """Gmail service with a single page of listed messages"""
+
+    def __init__(self, ids, failures=None):
+        self.ids, self.failures, self.batch_sizes = ids, failures or {}, []
+        messages = MagicMock()
+        messages.list.return_value.execute.return_value = {'messages': [{'id': i} for i in ids]}
+        messages.list_next.return_value = None
+        self.users = MagicMock(return_value=MagicMock(messages=MagicMock(return_value=messages)))
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+class TestBatchGetMessages(unittest.TestCase):
+    """Test batched message fetching"""
+
+    def setUp(self):
+        self.gmail = GmailAnalyzer.__new__(GmailAnalyzer)
+        sleep = patch.object(gmail_oauth.time, "sleep")
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def test_batches_capped_at_limit(self):
+        """Test: No batch carries more than GMAIL_BATCH_LIMIT gets"""
+        ids = [str(i) for i in range(120)]
+        self.gmail.service = FakeService(ids)
+
+        messages = self.gmail._batch_get_messages(ids)
+        self.assertEqual([m['id'] for m in messages], ids)
+        self.assertEqual(self.gmail.service.batch_sizes, [50, 50, 20])
+
+    def test_failed_sub_requests_retried(self):
+        """Test: A rate-limited get succeeds on the retry"""
+        self.gmail.service = FakeService(["a", "b", "c"], failures={"b": 1})
+
+        messages = self.gmail._batch_get_messages(["a", "b", "c"])
+        self.assertEqual([m['id'] for m in messages], ["a", "b", "c"])
+        self.assertEqual(self.gmail.service.batch_sizes, [3, 1])
+
+    def test_total_counts_listed_messages(self):
+        """Test: Messages that never fetch still count toward the total"""
+        self.gmail.service = FakeService(["a", "b", "c"], failures={"b": 2})
+
+        analysis = self.gmail.analyze_job_applications()
+        self.assertEqual(analysis['total_job_emails'], 3)
+        self.assertEqual(analysis['pending_responses'], 2)
+
+
+class TestMessageBody(unittest.TestCase):
+    """Test body extraction from FULL_MESSAGE_FIELDS partial responses"""
+
+    def setUp(self):
+        self.gmail = GmailAnalyzer.__new__(GmailAnalyzer)
+
+    @staticmethod
+    def part(text=None):
+        part = {'mimeType': 'text/plain'}
+        if text is not None:
+            part['body'] = {'data': base64.urlsafe_b64encode(text.encode()).decode()}
+        return part
+
+    def test_part_without_body_keeps_other_parts(self):
+        """Test: A text part missing 'body' does not drop the other parts"""
+        msg = {'payload': {'parts': [self.part('hello '), self.part(), self.part('world')]}}
+        self.assertEqual(self.gmail._get_message_body(msg), 'hello world')
+
+    def test_payload_without_body(self):
+        """Test: A single-part payload with no body is empty, not an error"""
+        self.assertEqual(self.gmail._get_message_body({'payload': {'headers': []}}), '')
+
+
+class TestRefreshAhead(unittest.TestCase):
+    """Test the exit-time token refresh hook"""
+
+    def setUp(self):
+        self.gmail = GmailAnalyzer.__new__(GmailAnalyzer)
+        self.gmail.token_path = MagicMock()
+        self.gmail.creds = None
+        self.gmail._refresh_ahead_registered = False
+        for name in ("Credentials", "build", "Request"):
+            patcher = patch.object(gmail_oauth, name, MagicMock(), create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_hook_registered_once(self):
+        """Test: Re-authenticating does not stack exit hooks"""
+        with patch.object(gmail_oauth.atexit, "register") as register:
+            self.gmail.authenticate()
+            self.gmail.authenticate()
+        register.assert_called_once_with(self.gmail._refresh_ahead)
+
+    def test_hook_uses_current_creds(self):
+        """Test: The hook refreshes the latest credentials, not the first"""
+        with patch.object(gmail_oauth.atexit, "register"):
+            self.gmail.authenticate()
+            first = self.gmail.creds
+            gmail_oauth.Credentials.from_authorized_user_file.return_value = MagicMock()
+            self.gmail.authenticate()
+        current = self.gmail.creds
+        current.expiry = first.expiry = gmail_oauth.datetime(2000, 1, 1)
+
+        with patch.object(self.gmail, "_save_credentials") as save:
+            self.gmail._refresh_ahead()
+        current.refresh.assert_called_once()
+        first.refresh.assert_not_called()
+        save.assert_called_once_with(current)
+
+    def test_no_creds_no_refresh(self):
+        """Test: The hook does nothing before authentication"""
+        self.gmail._refresh_ahead()
+
+
+if __name__ == "__main__":
+    unittest.main()